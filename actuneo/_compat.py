@@ -0,0 +1,27 @@
+"""
+Optional Dependency Shims
+
+Numba is an optional dependency of ACTUNEO. Modules that provide compiled
+kernels import ``njit`` and ``prange`` from here; when Numba is not installed
+these degrade to a no-op decorator and ``range`` so the same kernels still run
+as plain Python, and ``NUMBA_AVAILABLE`` lets callers prefer their NumPy paths.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+__all__ = ['njit', 'prange', 'NUMBA_AVAILABLE']
@@ -0,0 +1,136 @@
+"""
+Finance Kernels
+
+Numba-compiled inner loops for duration, convexity and Nelson-Siegel
+fitting. The duration kernels fuse discounting, weighting and accumulation
+into a single pass over float64 arrays (or, for level-coupon bonds, over
+coupon dates generated in the loop); callers should only dispatch to them
+when NUMBA_AVAILABLE is True and keep their NumPy implementation as the
+fallback. The Nelson-Siegel functions are written in NumPy and are valid
+with or without Numba.
+"""
+
+import math
+import numpy as np
+from .._compat import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def _macaulay(cf, t, y):
+    """Macaulay duration of cash flows cf at times t and yield y."""
+    ln1py = math.log1p(y)  # Loop invariant: one log, then one exp per cash flow
+    spv = 0.0
+    swpv = 0.0
+    for k in range(cf.shape[0]):
+        pv = cf[k] * math.exp(-t[k] * ln1py)
+        spv += pv
+        swpv += t[k] * pv
+    if spv == 0.0:
+        return 0.0
+    return swpv / spv
+
+
+@njit(cache=True, fastmath=True)
+def _convexity(cf, t, y):
+    """Convexity of cash flows cf at times t and yield y."""
+    ln1py = math.log1p(y)
+    spv = 0.0
+    swwpv = 0.0
+    for k in range(cf.shape[0]):
+        pv = cf[k] * math.exp(-t[k] * ln1py)
+        spv += pv
+        swwpv += t[k] * (t[k] + 1.0) * pv
+    if spv == 0.0:
+        return 0.0
+    return swwpv / (spv * (1.0 + y) ** 2)
+
+
+@njit(cache=True, fastmath=True)
+def _bond_sums(face, coupon, periods, frequency, y):
+    """PV, sum(t * pv) and sum(t * (t + 1) * pv) of a level-coupon bond.
+
+    The coupon dates k / frequency are generated inside the loop, so no cash
+    flow or time arrays are allocated.
+    """
+    ln1py = math.log1p(y)
+    spv = 0.0
+    swpv = 0.0
+    swwpv = 0.0
+    for k in range(1, periods + 1):
+        t = k / frequency
+        cf = coupon + face if k == periods else coupon
+        pv = cf * math.exp(-t * ln1py)
+        spv += pv
+        swpv += t * pv
+        swwpv += t * (t + 1.0) * pv
+    return spv, swpv, swwpv
+
+
+@njit(cache=True, fastmath=True)
+def _bond_macaulay(face, coupon, periods, frequency, y):
+    """Macaulay duration of a level-coupon bond."""
+    spv, swpv, _ = _bond_sums(face, coupon, periods, frequency, y)
+    if spv == 0.0:
+        return 0.0
+    return swpv / spv
+
+
+@njit(cache=True, fastmath=True)
+def _bond_convexity(face, coupon, periods, frequency, y):
+    """Convexity of a level-coupon bond."""
+    spv, _, swwpv = _bond_sums(face, coupon, periods, frequency, y)
+    if spv == 0.0:
+        return 0.0
+    return swwpv / (spv * (1.0 + y) ** 2)
+
+
+@njit(cache=True)
+def _ns_loading(u, decay):
+    """Slope loading (1 - exp(-u)) / u for a 1-d array u, taking its limit of 1 at u == 0."""
+    loading = np.ones_like(u)
+    nonzero = u != 0
+    loading[nonzero] = (1 - decay[nonzero]) / u[nonzero]
+    return loading
+
+
+@njit(cache=True)
+def _nelson_siegel(params, t):
+    """Nelson-Siegel yield for parameters (beta0, beta1, beta2, tau) at maturities t.
+
+    t is a 1-d array. At t == 0 the loading takes its limit of 1, so the short
+    end is beta0 + beta1 rather than 0/0.
+    """
+    beta0, beta1, beta2, tau = params[0], params[1], params[2], params[3]
+    u = t / tau
+    decay = np.exp(-u)
+    loading = _ns_loading(u, decay)
+    return beta0 + beta1 * loading + beta2 * (loading - decay)
+
+
+@njit(cache=True)
+def _ns_objective(params, t, y):
+    """Sum of squared Nelson-Siegel fitting errors."""
+    residual = _nelson_siegel(params, t) - y
+    return np.sum(residual ** 2)
+
+
+@njit(cache=True)
+def _ns_objective_grad(params, t, y):
+    """Analytic gradient of _ns_objective with respect to (beta0, beta1, beta2, tau)."""
+    beta0, beta1, beta2, tau = params[0], params[1], params[2], params[3]
+    u = t / tau
+    decay = np.exp(-u)
+    # At u == 0 the hump and the tau derivative below both vanish, as in the limit
+    loading = _ns_loading(u, decay)
+    hump = loading - decay
+    residual = beta0 + beta1 * loading + beta2 * hump - y
+
+    # d(loading)/d(tau) = hump / tau and d(decay)/d(tau) = decay * u / tau
+    d_tau = ((beta1 + beta2) * hump - beta2 * decay * u) / tau
+
+    grad = np.empty(4)
+    grad[0] = 2.0 * np.sum(residual)
+    grad[1] = 2.0 * np.sum(residual * loading)
+    grad[2] = 2.0 * np.sum(residual * hump)
+    grad[3] = 2.0 * np.sum(residual * d_tau)
+    return grad
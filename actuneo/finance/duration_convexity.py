@@ -5,9 +5,12 @@ Provides calculations for duration, convexity, and related risk measures
 for bonds and fixed income securities.
 """
 
+import math
 import numpy as np
 from typing import List, Union, Optional
 from .yield_curve import YieldCurve
+from ._kernels import (NUMBA_AVAILABLE, _macaulay, _convexity, _bond_macaulay,
+                       _bond_convexity)
 
 
 class DurationConvexity:
@@ -24,6 +27,34 @@ class DurationConvexity:
             yield_curve: YieldCurve instance for spot rate calculations
         """
         self.yield_curve = yield_curve
+        # Scratch buffer for the NumPy convexity path, grown on demand
+        self._work = None
+
+    def _scratch(self, n: int) -> np.ndarray:
+        """Return a reusable float64 work array of length n."""
+        if self._work is None or self._work.size < n:
+            self._work = np.empty(n)
+        return self._work[:n]
+
+    def _pv_components(self,
+                       cash_flows: List[float],
+                       times: List[float],
+                       yield_rate: float) -> tuple:
+        """
+        Calculate discounted cash flows shared by the duration and convexity measures.
+
+        Returns:
+            Tuple of (times array, present value array, total present value)
+        """
+        if len(cash_flows) != len(times):
+            raise ValueError("cash_flows and times must have the same length")
+
+        cf = np.asarray(cash_flows, dtype=np.float64)
+        t = np.asarray(times, dtype=np.float64)
+
+        # log1p(y) is shared by every cash flow, leaving one exp per cash flow
+        pv = cf * np.exp(-t * np.log1p(yield_rate))
+        return t, pv, pv.sum()
 
     def macaulay_duration(self,
                          cash_flows: List[float],
@@ -40,24 +71,20 @@ class DurationConvexity:
         Returns:
             Macaulay duration
         """
-        if len(cash_flows) != len(times):
-            raise ValueError("cash_flows and times must have the same length")
-
-        # Calculate present values
-        pv_cash_flows = []
-        for cf, t in zip(cash_flows, times):
-            pv = cf * (1 + yield_rate) ** (-t)
-            pv_cash_flows.append(pv)
+        if NUMBA_AVAILABLE:
+            if len(cash_flows) != len(times):
+                raise ValueError("cash_flows and times must have the same length")
+            return float(_macaulay(np.ascontiguousarray(cash_flows, dtype=np.float64),
+                                   np.ascontiguousarray(times, dtype=np.float64),
+                                   float(yield_rate)))
 
-        total_pv = sum(pv_cash_flows)
+        t, pv, total_pv = self._pv_components(cash_flows, times, yield_rate)
 
         if total_pv == 0:
             return 0.0
 
         # Calculate weighted average time
-        duration = sum(pv * t for pv, t in zip(pv_cash_flows, times)) / total_pv
-
-        return duration
+        return float(np.vdot(pv, t) / total_pv)
 
     def modified_duration(self,
                          cash_flows: List[float],
@@ -92,24 +119,23 @@ class DurationConvexity:
         Returns:
             Convexity measure
         """
-        if len(cash_flows) != len(times):
-            raise ValueError("cash_flows and times must have the same length")
+        if NUMBA_AVAILABLE:
+            if len(cash_flows) != len(times):
+                raise ValueError("cash_flows and times must have the same length")
+            return float(_convexity(np.ascontiguousarray(cash_flows, dtype=np.float64),
+                                    np.ascontiguousarray(times, dtype=np.float64),
+                                    float(yield_rate)))
 
-        # Calculate present values
-        pv_cash_flows = []
-        for cf, t in zip(cash_flows, times):
-            pv = cf * (1 + yield_rate) ** (-t)
-            pv_cash_flows.append(pv)
-
-        total_pv = sum(pv_cash_flows)
+        t, pv, total_pv = self._pv_components(cash_flows, times, yield_rate)
 
         if total_pv == 0:
             return 0.0
 
-        # Calculate convexity
-        convexity = sum(pv * t * (t + 1) for pv, t in zip(pv_cash_flows, times)) / (total_pv * (1 + yield_rate) ** 2)
-
-        return convexity
+        # Calculate convexity, forming t * (t + 1) in place in the scratch buffer
+        work = self._scratch(t.size)
+        np.add(t, 1.0, out=work)
+        work *= t
+        return float(np.dot(work, pv) / (total_pv * (1 + yield_rate) ** 2))
 
     def bond_duration(self,
                      face_value: float,
@@ -120,6 +146,10 @@ class DurationConvexity:
         """
         Calculate Macaulay duration for a standard bond.
 
+        Level coupons make the present value sums geometric series, so the
+        duration is evaluated in closed form rather than by summing over
+        every coupon date.
+
         Args:
             face_value: Face value of the bond
             coupon_rate: Annual coupon rate (decimal)
@@ -130,16 +160,15 @@ class DurationConvexity:
         Returns:
             Macaulay duration
         """
-        # Generate cash flows
-        periods = int(maturity * frequency)
-        coupon_payment = face_value * coupon_rate / frequency
+        sums = self._bond_power_sums(face_value, coupon_rate, maturity, yield_rate, frequency)
+        if sums is None:
+            return self._bond_duration_general(face_value, coupon_rate, maturity, yield_rate, frequency)
 
-        cash_flows = [coupon_payment] * periods
-        cash_flows[-1] += face_value  # Add face value to final payment
+        pv, weighted_pv, _ = sums
+        if pv == 0:
+            return 0.0
 
-        times = [(i + 1) / frequency for i in range(periods)]
-
-        return self.macaulay_duration(cash_flows, times, yield_rate)
+        return weighted_pv / (pv * frequency)
 
     def bond_convexity(self,
                       face_value: float,
@@ -150,6 +179,9 @@ class DurationConvexity:
         """
         Calculate convexity for a standard bond.
 
+        Evaluated in closed form from the same geometric series as
+        bond_duration.
+
         Args:
             face_value: Face value of the bond
             coupon_rate: Annual coupon rate (decimal)
@@ -160,16 +192,107 @@ class DurationConvexity:
         Returns:
             Convexity
         """
-        # Generate cash flows
+        sums = self._bond_power_sums(face_value, coupon_rate, maturity, yield_rate, frequency)
+        if sums is None:
+            return self._bond_convexity_general(face_value, coupon_rate, maturity, yield_rate, frequency)
+
+        pv, weighted_pv, squared_weighted_pv = sums
+        if pv == 0:
+            return 0.0
+
+        # sum of pv * t * (t + 1) with t = k / frequency
+        weighted_sum = squared_weighted_pv / frequency ** 2 + weighted_pv / frequency
+
+        return weighted_sum / (pv * (1 + yield_rate) ** 2)
+
+    def _bond_duration_general(self,
+                               face_value: float,
+                               coupon_rate: float,
+                               maturity: float,
+                               yield_rate: float,
+                               frequency: int = 2) -> float:
+        """Calculate bond duration by summing over the generated cash flows."""
+        if NUMBA_AVAILABLE:
+            periods = int(maturity * frequency)
+            return float(_bond_macaulay(float(face_value), face_value * coupon_rate / frequency,
+                                        periods, float(frequency), float(yield_rate)))
+
+        cash_flows, times = self._bond_cash_flows(face_value, coupon_rate, maturity, frequency)
+
+        return self.macaulay_duration(cash_flows, times, yield_rate)
+
+    def _bond_convexity_general(self,
+                                face_value: float,
+                                coupon_rate: float,
+                                maturity: float,
+                                yield_rate: float,
+                                frequency: int = 2) -> float:
+        """Calculate bond convexity by summing over the generated cash flows."""
+        if NUMBA_AVAILABLE:
+            periods = int(maturity * frequency)
+            return float(_bond_convexity(float(face_value), face_value * coupon_rate / frequency,
+                                         periods, float(frequency), float(yield_rate)))
+
+        cash_flows, times = self._bond_cash_flows(face_value, coupon_rate, maturity, frequency)
+
+        return self.convexity(cash_flows, times, yield_rate)
+
+    def _bond_power_sums(self,
+                         face_value: float,
+                         coupon_rate: float,
+                         maturity: float,
+                         yield_rate: float,
+                         frequency: int) -> Optional[tuple]:
+        """
+        Closed-form present value sums for a level-coupon bond.
+
+        With per-period discount factor v = (1 + yield_rate) ** (-1 / frequency)
+        and n coupon periods, returns sum(CF_k v^k), sum(k CF_k v^k) and
+        sum(k^2 CF_k v^k) using the geometric series recurrences
+        S_m = (1 + r) / r * (...), where r is the per-period rate.
+
+        Returns None when the recurrences lose precision (total discounting
+        over the life of the bond is tiny) so callers use the summation path.
+        """
         periods = int(maturity * frequency)
+        if periods <= 0 or yield_rate <= -1:
+            return None
+
+        log_growth = math.log1p(yield_rate) / frequency
+        r = math.expm1(log_growth)  # Per-period effective rate
+        if abs(periods * r) < 0.05:
+            return None
+
+        v_n = math.exp(-periods * log_growth)
+        v_n1 = v_n / (1 + r)
+
+        s0 = -math.expm1(-periods * log_growth) / r
+        s1 = (1 + r) * (s0 - periods * v_n1) / r
+        s2 = (1 + r) * (2 * s1 - s0 - periods ** 2 * v_n1) / r
+
         coupon_payment = face_value * coupon_rate / frequency
 
-        cash_flows = [coupon_payment] * periods
+        pv = coupon_payment * s0 + face_value * v_n
+        weighted_pv = coupon_payment * s1 + face_value * periods * v_n
+        squared_weighted_pv = coupon_payment * s2 + face_value * periods ** 2 * v_n
+
+        return pv, weighted_pv, squared_weighted_pv
+
+    def _bond_cash_flows(self,
+                         face_value: float,
+                         coupon_rate: float,
+                         maturity: float,
+                         frequency: int) -> tuple:
+        """Generate cash flow and time arrays for a standard coupon bond."""
+        periods = int(maturity * frequency)
+        coupon_payment = face_value * coupon_rate / frequency
+
+        cash_flows = np.full(periods, coupon_payment, dtype=np.float64)
         cash_flows[-1] += face_value  # Add face value to final payment
 
-        times = [(i + 1) / frequency for i in range(periods)]
+        times = np.arange(1, periods + 1, dtype=np.float64) / frequency
 
-        return self.convexity(cash_flows, times, yield_rate)
+        return cash_flows, times
 
     def price_change_approximation(self,
                                  duration: float,
@@ -207,41 +330,97 @@ class DurationConvexity:
         Returns:
             Portfolio duration (modified duration)
         """
-        total_value = 0
-        weighted_duration = 0
+        if len(positions) == 0:
+            return 0.0
+
+        cash_flows_2d, times_2d, mask, yields, position_values = self._positions_to_soa(
+            positions, yield_rate)
+
+        return self.portfolio_duration_soa(cash_flows_2d, times_2d, mask, yields, position_values)
+
+    def portfolio_duration_soa(self,
+                               cash_flows_2d: np.ndarray,
+                               times_2d: np.ndarray,
+                               mask: np.ndarray,
+                               yields: Union[float, np.ndarray],
+                               position_values: Optional[np.ndarray] = None) -> float:
+        """
+        Calculate portfolio duration from column-oriented position data.
+
+        Args:
+            cash_flows_2d: Cash flows of shape (P, Nmax), zero-padded per position
+            times_2d: Cash flow times of shape (P, Nmax)
+            mask: Boolean array of shape (P, Nmax) marking valid cash flows
+            yields: Yield rate per position, or a common yield rate
+            position_values: Value of each position used for weighting. NaN entries,
+                            or None for all positions, use the position's present value
+
+        Returns:
+            Portfolio duration (modified duration)
+        """
+        cf = np.asarray(cash_flows_2d, dtype=np.float64)
+        t = np.asarray(times_2d, dtype=np.float64)
+        y = np.broadcast_to(np.asarray(yields, dtype=np.float64), (cf.shape[0],))
+
+        discount = np.exp(-t * np.log1p(y)[:, None])
+        discount *= np.asarray(mask, dtype=bool)
+
+        # Row-wise dot products, without materializing the discounted cash flows
+        pv = np.einsum('pn,pn->p', cf, discount)
+        weighted_times = np.einsum('pn,pn,pn->p', cf, discount, t)
 
-        for position in positions:
+        # Positions with zero present value have zero duration
+        macaulay = np.divide(weighted_times, pv, out=np.zeros_like(pv), where=pv != 0)
+        modified = macaulay / (1 + y)
+
+        if position_values is None:
+            values = pv
+        else:
+            values = np.asarray(position_values, dtype=np.float64)
+            values = np.where(np.isnan(values), pv, values)
+
+        total_value = values.sum()
+        if total_value == 0:
+            return 0.0
+
+        return float(values @ modified / total_value)
+
+    def _positions_to_soa(self,
+                          positions: List[dict],
+                          yield_rate: Optional[float] = None):
+        """Convert position dictionaries into zero-padded arrays for portfolio_duration_soa."""
+        n_positions = len(positions)
+        n_max = max(len(position['cash_flows']) for position in positions)
+
+        cash_flows_2d = np.zeros((n_positions, n_max))
+        times_2d = np.zeros((n_positions, n_max))
+        mask = np.zeros((n_positions, n_max), dtype=bool)
+        yields = np.empty(n_positions)
+        position_values = np.full(n_positions, np.nan)
+
+        for p, position in enumerate(positions):
             cash_flows = position['cash_flows']
             times = position['times']
+            if len(cash_flows) != len(times):
+                raise ValueError("cash_flows and times must have the same length")
+
+            n = len(cash_flows)
+            cash_flows_2d[p, :n] = cash_flows
+            times_2d[p, :n] = times
+            mask[p, :n] = True
 
-            # Calculate present value of position
             if yield_rate is None:
                 # Assume positions have their own yields
-                position_yield = position.get('yield_rate', 0.05)
+                yields[p] = position.get('yield_rate', 0.05)
             else:
-                position_yield = yield_rate
-
-            pv = sum(cf * (1 + position_yield) ** (-t) for cf, t in zip(cash_flows, times))
+                yields[p] = yield_rate
 
-            # Get weight
             if 'weight' in position:
-                weight = position['weight']
-                position_value = weight
+                position_values[p] = position['weight']
             elif 'market_value' in position:
-                position_value = position['market_value']
-            else:
-                position_value = pv
-
-            total_value += position_value
+                position_values[p] = position['market_value']
 
-            # Calculate position duration
-            duration = self.modified_duration(cash_flows, times, position_yield)
-            weighted_duration += position_value * duration
-
-        if total_value == 0:
-            return 0.0
-
-        return weighted_duration / total_value
+        return cash_flows_2d, times_2d, mask, yields, position_values
 
     def key_rate_duration(self,
                          cash_flows: List[float],
@@ -260,16 +439,35 @@ class DurationConvexity:
         Returns:
             Dictionary of key rate durations
         """
+        shift = 0.0001  # 1 bp shift
+
+        if yield_curve.interpolation_method == 'linear':
+            # Linear interpolation is linear in the node yields, so bumping node k
+            # moves the yield at each cash flow time by shift * weight_k(t). All
+            # shifted prices then come from one (K, N) discount matrix.
+            cf = np.asarray(cash_flows, dtype=np.float64)
+            t = np.asarray(times, dtype=np.float64)
+            base_yields = yield_curve.get_yields(t)
+            base_price = np.dot(cf, np.exp(-t * np.log1p(base_yields)))
+
+            nodes = np.abs(yield_curve.maturities[None, :]
+                           - np.asarray(key_rates, dtype=np.float64)[:, None]).argmin(axis=1)
+            shifted_yields = base_yields + shift * yield_curve.linear_node_weights(t)[nodes]
+            shifted_prices = np.einsum('j,kj->k', cf, np.exp(-t * np.log1p(shifted_yields)))
+
+            durations = -(shifted_prices - base_price) / (base_price * shift)
+            return dict(zip(key_rates, durations.tolist()))
+
         base_price = self._calculate_pv_with_yield_curve(cash_flows, times, yield_curve)
         key_rate_durations = {}
 
         for key_rate in key_rates:
             # Shift yield curve at key rate
-            shifted_curve = self._shift_yield_curve(yield_curve, key_rate, 0.0001)  # 1 bp shift
+            shifted_curve = self._shift_yield_curve(yield_curve, key_rate, shift)
             shifted_price = self._calculate_pv_with_yield_curve(cash_flows, times, shifted_curve)
 
             # Calculate duration
-            duration = -(shifted_price - base_price) / (base_price * 0.0001)
+            duration = -(shifted_price - base_price) / (base_price * shift)
             key_rate_durations[key_rate] = duration
 
         return key_rate_durations
@@ -279,23 +477,12 @@ class DurationConvexity:
                                       times: List[float],
                                       yield_curve: YieldCurve) -> float:
         """Calculate present value using yield curve."""
-        pv = 0
-        for cf, t in zip(cash_flows, times):
-            discount_factor = yield_curve.get_discount_factor(t)
-            pv += cf * discount_factor
-        return pv
+        return float(yield_curve.price_bond_batch(cash_flows, times))
 
     def _shift_yield_curve(self,
                           yield_curve: YieldCurve,
                           shift_maturity: float,
                           shift_amount: float) -> YieldCurve:
-        """Create a shifted copy of the yield curve."""
-        # This is a simplified implementation
-        new_maturities = yield_curve.maturities.copy()
-        new_yields = yield_curve.yields.copy()
-
-        # Find closest maturity and shift it
-        idx = np.argmin(np.abs(new_maturities - shift_maturity))
-        new_yields[idx] += shift_amount
-
-        return YieldCurve(new_maturities, new_yields, yield_curve.interpolation_method)
+        """Create a copy of the yield curve shifted at the closest maturity."""
+        idx = int(np.argmin(np.abs(yield_curve.maturities - shift_maturity)))
+        return yield_curve.with_bumped_yield(idx, shift_amount)
@@ -5,10 +5,39 @@ Provides functions for interest calculations, present value, future value,
 and various interest rate conversions.
 """
 
+import math
 import numpy as np
+from numbers import Real
 from typing import Union, Optional
 
 
+def _as_output(value) -> Union[float, np.ndarray]:
+    """Return a Python float for scalar results and an ndarray otherwise."""
+    value = np.asarray(value, dtype=np.float64)
+    return float(value) if value.ndim == 0 else value
+
+
+def _scalar_loan_terms(i, n) -> bool:
+    """
+    True when a loan can take the math-module path: plain scalars with i > -1.
+
+    Raises ValueError for a scalar term that is not positive.
+    """
+    if not (isinstance(i, Real) and isinstance(n, Real)):
+        return False
+    if not n > 0:
+        raise ValueError("periods must be positive")
+    return i > -1
+
+
+def _positive_periods(periods) -> np.ndarray:
+    """Return periods as a float64 array, raising ValueError if any term is not positive."""
+    n = np.asarray(periods, dtype=np.float64)
+    if not np.all(n > 0):
+        raise ValueError("periods must be positive")
+    return n
+
+
 class InterestTheory:
     """
     A class for performing various interest rate calculations and
@@ -65,13 +94,16 @@ class InterestTheory:
         return future_value * (1 + i) ** (-periods)
 
     def annuity_present_value(self,
-                            payment: float,
-                            periods: int,
-                            interest_rate: Optional[float] = None,
-                            immediate: bool = True) -> float:
+                            payment: Union[float, np.ndarray],
+                            periods: Union[int, np.ndarray],
+                            interest_rate: Optional[Union[float, np.ndarray]] = None,
+                            immediate: bool = True) -> Union[float, np.ndarray]:
         """
         Calculate present value of an annuity.
 
+        Inputs may be scalars or arrays; arrays are broadcast against each
+        other so a whole book of annuities can be valued in one call.
+
         Args:
             payment: Periodic payment amount
             periods: Number of periods
@@ -79,28 +111,31 @@ class InterestTheory:
             immediate: True for immediate annuity, False for annuity-due
 
         Returns:
-            Present value of annuity
+            Present value of annuity (float for scalar inputs, otherwise ndarray)
         """
-        i = interest_rate if interest_rate is not None else self.i
+        i = np.asarray(interest_rate if interest_rate is not None else self.i, dtype=np.float64)
+        n = np.asarray(periods, dtype=np.float64)
 
-        if i == 0:
-            return payment * periods
+        # Immediate annuity: payments at end of each period. The denominator is
+        # replaced by 1 where i == 0 so no division by zero is ever evaluated.
+        factor = np.where(i == 0, n, -np.expm1(-n * np.log1p(i)) / np.where(i == 0, 1.0, i))
 
-        if immediate:
-            # Immediate annuity: payments at end of each period
-            return payment * ((1 - (1 + i) ** (-periods)) / i)
-        else:
+        if not immediate:
             # Annuity-due: payments at beginning of each period
-            return payment * ((1 - (1 + i) ** (-periods)) / i) * (1 + i)
+            factor = factor * (1 + i)
+
+        return _as_output(payment * factor)
 
     def annuity_future_value(self,
-                           payment: float,
-                           periods: int,
-                           interest_rate: Optional[float] = None,
-                           immediate: bool = True) -> float:
+                           payment: Union[float, np.ndarray],
+                           periods: Union[int, np.ndarray],
+                           interest_rate: Optional[Union[float, np.ndarray]] = None,
+                           immediate: bool = True) -> Union[float, np.ndarray]:
         """
         Calculate future value of an annuity.
 
+        Inputs may be scalars or arrays and are broadcast against each other.
+
         Args:
             payment: Periodic payment amount
             periods: Number of periods
@@ -108,50 +143,71 @@ class InterestTheory:
             immediate: True for immediate annuity, False for annuity-due
 
         Returns:
-            Future value of annuity
+            Future value of annuity (float for scalar inputs, otherwise ndarray)
         """
-        i = interest_rate if interest_rate is not None else self.i
+        i = np.asarray(interest_rate if interest_rate is not None else self.i, dtype=np.float64)
+        n = np.asarray(periods, dtype=np.float64)
 
-        if i == 0:
-            return payment * periods
+        # Immediate annuity
+        factor = np.where(i == 0, n, np.expm1(n * np.log1p(i)) / np.where(i == 0, 1.0, i))
 
-        if immediate:
-            # Immediate annuity
-            return payment * (((1 + i) ** periods - 1) / i)
-        else:
+        if not immediate:
             # Annuity-due
-            return payment * (((1 + i) ** periods - 1) / i) * (1 + i)
+            factor = factor * (1 + i)
+
+        return _as_output(payment * factor)
 
     def loan_payment(self,
-                    principal: float,
-                    periods: int,
-                    interest_rate: Optional[float] = None) -> float:
+                    principal: Union[float, np.ndarray],
+                    periods: Union[int, np.ndarray],
+                    interest_rate: Optional[Union[float, np.ndarray]] = None
+                    ) -> Union[float, np.ndarray]:
         """
         Calculate periodic loan payment amount.
 
+        Inputs may be scalars or arrays and are broadcast against each other.
+
         Args:
             principal: Loan principal amount
             periods: Number of periods
             interest_rate: Override default interest rate
 
         Returns:
-            Periodic payment amount
+            Periodic payment amount (float for scalar inputs, otherwise ndarray)
         """
-        i = interest_rate if interest_rate is not None else self.i
-
-        if i == 0:
-            return principal / periods
-
-        return principal * (i * (1 + i) ** periods) / ((1 + i) ** periods - 1)
+        rate = interest_rate if interest_rate is not None else self.i
+        if isinstance(principal, Real) and _scalar_loan_terms(rate, periods):
+            # Single loan: the same formula in scalar math, with no array round trip
+            if rate == 0:
+                return float(principal / periods)
+            return float(principal * rate / -math.expm1(-periods * math.log1p(rate)))
+
+        i = np.asarray(rate, dtype=np.float64)
+        n = _positive_periods(periods)
+
+        # payment = L * i / (1 - v^n), with 1 - v^n formed by expm1 as in annuity_present_value.
+        # The factor is zero only where i == 0, which np.where discards, so it is replaced by 1
+        # there rather than suppressing the division warning for every element.
+        annuity_factor = -np.expm1(-n * np.log1p(i))
+        payment = np.where(i == 0,
+                           principal / n,
+                           principal * i / np.where(i == 0, 1.0, annuity_factor))
+
+        return _as_output(payment)
 
     def loan_balance(self,
-                    principal: float,
-                    periods: int,
-                    payments_made: int,
-                    interest_rate: Optional[float] = None) -> float:
+                    principal: Union[float, np.ndarray],
+                    periods: Union[int, np.ndarray],
+                    payments_made: Union[int, np.ndarray],
+                    interest_rate: Optional[Union[float, np.ndarray]] = None
+                    ) -> Union[float, np.ndarray]:
         """
         Calculate remaining loan balance after certain number of payments.
 
+        Uses the closed form B_k = L * ((1+i)^n - (1+i)^k) / ((1+i)^n - 1), which
+        equals the present value of the remaining level payments. Inputs may be
+        scalars or arrays and are broadcast against each other.
+
         Args:
             principal: Original loan principal
             periods: Total number of periods
@@ -159,16 +215,32 @@ class InterestTheory:
             interest_rate: Override default interest rate
 
         Returns:
-            Remaining balance
+            Remaining balance (float for scalar inputs, otherwise ndarray)
         """
-        i = interest_rate if interest_rate is not None else self.i
-        payment = self.loan_payment(principal, periods, i)
-
-        # Future value of remaining payments
-        remaining_periods = periods - payments_made
-        remaining_annuity_pv = self.annuity_present_value(payment, remaining_periods, i, immediate=True)
-
-        return remaining_annuity_pv
+        rate = interest_rate if interest_rate is not None else self.i
+        if (isinstance(principal, Real) and isinstance(payments_made, Real)
+                and _scalar_loan_terms(rate, periods)):
+            if rate == 0:
+                return float(principal * (periods - payments_made) / periods)
+            log_growth = math.log1p(rate)
+            return float(principal * math.exp(payments_made * log_growth)
+                         * math.expm1((periods - payments_made) * log_growth)
+                         / math.expm1(periods * log_growth))
+
+        i = np.asarray(rate, dtype=np.float64)
+        n = _positive_periods(periods)
+        k = np.asarray(payments_made, dtype=np.float64)
+
+        # (1+i)^n - (1+i)^k = (1+i)^k * expm1((n-k) log(1+i)), so one log serves every power.
+        # The denominator is zero only in the i == 0 branch that np.where discards.
+        log_growth = np.log1p(i)
+        accumulation_less_one = np.expm1(n * log_growth)
+        balance = np.where(i == 0,
+                           principal * (n - k) / n,
+                           principal * np.exp(k * log_growth) * np.expm1((n - k) * log_growth)
+                           / np.where(i == 0, 1.0, accumulation_less_one))
+
+        return _as_output(balance)
 
     def effective_annual_rate(self,
                             nominal_rate: float,
@@ -201,24 +273,26 @@ class InterestTheory:
         return compounding_freq * ((1 + effective_rate) ** (1 / compounding_freq) - 1)
 
     def real_interest_rate(self,
-                          nominal_rate: float,
-                          inflation_rate: float) -> float:
+                          nominal_rate: Union[float, np.ndarray],
+                          inflation_rate: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate real interest rate using Fisher equation.
 
+        Evaluated in log space, which avoids cancellation when both rates are small.
+
         Args:
             nominal_rate: Nominal interest rate
             inflation_rate: Inflation rate
 
         Returns:
-            Real interest rate
+            Real interest rate (float for scalar inputs, otherwise ndarray)
         """
-        return (1 + nominal_rate) / (1 + inflation_rate) - 1
+        return _as_output(np.expm1(np.log1p(nominal_rate) - np.log1p(inflation_rate)))
 
     def inflation_adjusted_value(self,
-                               nominal_value: float,
-                               inflation_rate: float,
-                               periods: Union[int, float]) -> float:
+                               nominal_value: Union[float, np.ndarray],
+                               inflation_rate: Union[float, np.ndarray],
+                               periods: Union[int, float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate inflation-adjusted (real) value.
 
@@ -228,6 +302,6 @@ class InterestTheory:
             periods: Number of periods
 
         Returns:
-            Real value adjusted for inflation
+            Real value adjusted for inflation (float for scalar inputs, otherwise ndarray)
         """
-        return nominal_value / (1 + inflation_rate) ** periods
+        return _as_output(nominal_value * np.exp(-np.multiply(periods, np.log1p(inflation_rate))))
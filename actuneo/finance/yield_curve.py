@@ -5,9 +5,19 @@ Provides tools for constructing and analyzing yield curves,
 including spot rates, forward rates, and various interpolation methods.
 """
 
+import copy
+import math
+from bisect import bisect_right
 import numpy as np
-from typing import List, Union, Optional, Dict, Callable
-import matplotlib.pyplot as plt
+from typing import List, Union, Optional, Dict, Callable, Tuple
+from ._kernels import _nelson_siegel, _ns_objective, _ns_objective_grad
+
+
+def _frozen(values: Union[List[float], np.ndarray]) -> np.ndarray:
+    """Return a read-only float64 copy of values."""
+    arr = np.array(values, dtype=float)
+    arr.flags.writeable = False
+    return arr
 
 
 class YieldCurve:
@@ -30,28 +40,79 @@ class YieldCurve:
             yields: Yield rates (decimal)
             interpolation_method: Method for interpolation ('linear', 'cubic', 'nelson_siegel')
         """
-        self.maturities = np.array(maturities, dtype=float)
-        self.yields = np.array(yields, dtype=float)
+        # Memoized scalar discount factors, keyed by maturity
+        self._df_cache: Dict[float, float] = {}
+        # Node lists for the scalar linear interpolation, built on first use
+        self._knots: Optional[Tuple[List[float], List[float]]] = None
+
+        # Written to the backing arrays directly; the public setters rebuild the
+        # interpolant, which happens once below after validation and sorting
+        self._maturities = np.array(maturities, dtype=float)
+        self._yields = np.array(yields, dtype=float)
         self.interpolation_method = interpolation_method
 
-        # Sort by maturity
-        sort_idx = np.argsort(self.maturities)
-        self.maturities = self.maturities[sort_idx]
-        self.yields = self.yields[sort_idx]
-
         # Validate inputs
         if len(self.maturities) != len(self.yields):
             raise ValueError("maturities and yields must have the same length")
 
-        if not np.all(self.maturities > 0):
+        # Sort by maturity, skipping the reindex when already sorted
+        if not np.all(np.diff(self.maturities) >= 0):
+            sort_idx = np.argsort(self.maturities)
+            self._maturities = self._maturities[sort_idx]
+            self._yields = self._yields[sort_idx]
+
+        if self.maturities.size and not self.maturities.min() > 0:
             raise ValueError("All maturities must be positive")
 
+        # The node arrays are read-only so that an in-place edit cannot leave the
+        # interpolant and caches out of date; assign a new array to change them
+        self._maturities.flags.writeable = False
+        self._yields.flags.writeable = False
+
         # Set up interpolation function
         self._setup_interpolation()
 
+    @property
+    def maturities(self) -> np.ndarray:
+        """Curve node maturities in years (read-only; assign a new array to change them)."""
+        return self._maturities
+
+    @maturities.setter
+    def maturities(self, value: Union[List[float], np.ndarray]):
+        self._maturities = _frozen(value)
+        self._curve_changed()
+
+    @property
+    def yields(self) -> np.ndarray:
+        """Curve node yields in decimal (read-only; assign a new array to change them)."""
+        return self._yields
+
+    @yields.setter
+    def yields(self, value: Union[List[float], np.ndarray]):
+        self._yields = _frozen(value)
+        self._curve_changed()
+
+    def _curve_changed(self):
+        """
+        Drop cached values and rebuild the interpolant after the nodes are replaced.
+
+        The rebuild waits while maturities and yields differ in length, so both
+        can be replaced one after the other.
+        """
+        self._df_cache.clear()
+        self._knots = None
+        if len(self._maturities) == len(self._yields):
+            self._setup_interpolation()
+
     def _setup_interpolation(self):
         """Set up the interpolation method."""
         if self.interpolation_method == 'linear':
+            # Slope of the last segment, used to extrapolate beyond the longest maturity
+            if len(self.maturities) > 1:
+                self._right_slope = ((self.yields[-1] - self.yields[-2])
+                                     / (self.maturities[-1] - self.maturities[-2]))
+            else:
+                self._right_slope = 0.0
             self._interp_func = self._linear_interpolation
         elif self.interpolation_method == 'cubic':
             from scipy.interpolate import interp1d
@@ -63,45 +124,145 @@ class YieldCurve:
         else:
             raise ValueError(f"Unknown interpolation method: {self.interpolation_method}")
 
-    def _linear_interpolation(self, t: float) -> float:
-        """Linear interpolation for yields."""
-        if t <= self.maturities[0]:
-            return self.yields[0]
-        elif t >= self.maturities[-1]:
-            # Linear extrapolation
-            slope = (self.yields[-1] - self.yields[-2]) / (self.maturities[-1] - self.maturities[-2])
-            return self.yields[-1] + slope * (t - self.maturities[-1])
+        self._bind_scalar_yield()
+
+    def _bind_scalar_yield(self):
+        """Choose the scalar yield function once, so get_yield does not branch per call."""
+        if self.interpolation_method == 'linear':
+            self._scalar_yield = self._linear_scalar
         else:
-            # Linear interpolation
-            idx = np.searchsorted(self.maturities, t) - 1
-            t1, t2 = self.maturities[idx], self.maturities[idx + 1]
-            y1, y2 = self.yields[idx], self.yields[idx + 1]
-            return y1 + (y2 - y1) * (t - t1) / (t2 - t1)
+            interp_func = self._interp_func
+            self._scalar_yield = lambda t: float(interp_func(t))
+
+    def _linear_interpolation(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Linear interpolation for yields.
+
+        Flat below the shortest maturity and linearly extrapolated from the last
+        segment beyond the longest maturity. Accepts scalars or arrays.
+        """
+        interpolated = np.interp(t, self.maturities, self.yields)
+        return interpolated + self._right_slope * np.maximum(np.subtract(t, self.maturities[-1]), 0.0)
+
+    def _linear_scalar(self, t: float) -> float:
+        """
+        Scalar form of _linear_interpolation.
+
+        Bisects Python lists of the nodes and blends the bracketing yields, which
+        avoids the array dispatch of np.interp for a single maturity.
+        """
+        knots = self._knots
+        if knots is None:
+            knots = self._knots = (self._maturities.tolist(), self._yields.tolist())
+        ts, ys = knots
+
+        t = float(t)
+        if t <= ts[0]:
+            return ys[0]
+        if t >= ts[-1]:
+            return ys[-1] + float(self._right_slope) * (t - ts[-1])
+
+        k = bisect_right(ts, t)
+        frac = (t - ts[k - 1]) / (ts[k] - ts[k - 1])
+        return ys[k - 1] + (ys[k] - ys[k - 1]) * frac
+
+    def linear_node_weights(self, times: Union[List[float], np.ndarray]) -> np.ndarray:
+        """
+        Weights of each node yield in the linearly interpolated yield at the given times.
+
+        Row k is the linearly interpolated curve obtained from a unit yield at node
+        k and zero elsewhere, with a flat left tail and a linear right tail. Since
+        linear interpolation is linear in the node yields, bumping node k by delta
+        moves the yield at every time by delta * row k.
+
+        Args:
+            times: Times to maturity in years
+
+        Returns:
+            Array of shape (len(maturities), len(times))
+        """
+        t = np.asarray(times, dtype=float)
+        n_nodes = len(self.maturities)
+        weights = np.zeros((n_nodes, t.size))
+
+        if n_nodes == 1:
+            weights[0] = 1.0
+            return weights
+
+        # Segment containing each t; the outer segments are extended for extrapolation
+        idx = np.clip(np.searchsorted(self.maturities, t, side='right') - 1, 0, n_nodes - 2)
+        frac = (t - self.maturities[idx]) / (self.maturities[idx + 1] - self.maturities[idx])
+        frac = np.maximum(frac, 0.0)  # Flat below the shortest maturity
+
+        columns = np.arange(t.size)
+        weights[idx, columns] = 1.0 - frac
+        weights[idx + 1, columns] = frac
+        return weights
 
     def _fit_nelson_siegel(self):
         """Fit Nelson-Siegel model to the yield curve."""
         from scipy.optimize import minimize
 
-        def nelson_siegel(params, t):
-            beta0, beta1, beta2, tau = params
-            return beta0 + beta1 * (1 - np.exp(-t/tau)) / (t/tau) + beta2 * ((1 - np.exp(-t/tau)) / (t/tau) - np.exp(-t/tau))
-
-        def objective(params):
-            predicted = nelson_siegel(params, self.maturities)
-            return np.sum((predicted - self.yields) ** 2)
-
         # Initial guess
-        initial_params = [self.yields[0], -0.01, 0.01, 2.0]
-
-        # Fit parameters
-        result = minimize(objective, initial_params, bounds=[(None, None), (None, None), (None, None), (0.1, 10)])
+        initial_params = np.array([self.yields[0], -0.01, 0.01, 2.0])
+
+        # Fit parameters using the analytic gradient of the squared error
+        result = minimize(_ns_objective, initial_params,
+                          args=(self.maturities, self.yields),
+                          jac=_ns_objective_grad,
+                          method='L-BFGS-B',
+                          bounds=[(None, None), (None, None), (None, None), (0.1, 10)])
         self.ns_params = result.x
 
         def interp_func(t):
-            return nelson_siegel(self.ns_params, t)
+            # The kernel takes 1-d maturities; scalars come back as 0-d arrays
+            t = np.asarray(t, dtype=float)
+            return _nelson_siegel(self.ns_params, t.reshape(-1)).reshape(t.shape)
 
         self._interp_func = interp_func
 
+    def with_bumped_yield(self, idx: int, delta: float) -> 'YieldCurve':
+        """
+        Return a copy of the curve with the yield at one node shifted.
+
+        The read-only maturities array is shared with this curve. Linear and
+        cubic curves rebuild their interpolant from the bumped yields, which is
+        cheap and needs no re-sorting. A Nelson-Siegel curve is not refitted:
+        the bump is added to the fitted output as a tent of height delta at the
+        bumped node, decaying linearly to zero at the neighbouring nodes.
+
+        Args:
+            idx: Index of the node to bump
+            delta: Yield shift (decimal)
+
+        Returns:
+            Bumped YieldCurve instance
+        """
+        bumped = copy.copy(self)
+        bumped._df_cache = {}
+        bumped._knots = None
+
+        bumped._maturities = self._maturities
+
+        yields = self._yields.copy()
+        yields[idx] += delta
+        yields.flags.writeable = False
+        bumped._yields = yields
+
+        if self.interpolation_method == 'nelson_siegel':
+            fitted = self._interp_func
+
+            def interp_func(t):
+                tent = self.linear_node_weights(np.atleast_1d(t))[idx].reshape(np.shape(t))
+                return fitted(t) + delta * tent
+
+            bumped._interp_func = interp_func
+            bumped._bind_scalar_yield()
+        else:
+            bumped._setup_interpolation()
+
+        return bumped
+
     def get_yield(self, maturity: float) -> float:
         """
         Get yield for a specific maturity using interpolation.
@@ -112,10 +273,19 @@ class YieldCurve:
         Returns:
             Interpolated yield rate
         """
-        if callable(self._interp_func):
-            return float(self._interp_func(maturity))
-        else:
-            return self._interp_func(maturity)
+        return self._scalar_yield(maturity)
+
+    def get_yields(self, maturities: Union[List[float], np.ndarray]) -> np.ndarray:
+        """
+        Get yields for an array of maturities in a single interpolation call.
+
+        Args:
+            maturities: Times to maturity in years
+
+        Returns:
+            Array of interpolated yield rates
+        """
+        return np.asarray(self._interp_func(np.asarray(maturities, dtype=float)), dtype=float)
 
     def get_spot_rate(self, maturity: float) -> float:
         """
@@ -147,10 +317,26 @@ class YieldCurve:
         spot_start = self.get_spot_rate(start_time)
         spot_end = self.get_spot_rate(end_time)
 
-        # Forward rate calculation
-        forward_rate = ((1 + spot_end) ** end_time / (1 + spot_start) ** start_time) ** (1 / (end_time - start_time)) - 1
+        # Forward rate from the difference of log accumulations, leaving a single expm1
+        log_growth = end_time * math.log1p(spot_end) - start_time * math.log1p(spot_start)
+        return math.expm1(log_growth / (end_time - start_time))
+
+    def forward_rate_curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate forward rates between consecutive curve maturities.
+
+        Returns:
+            Tuple of (segment midpoints, forward rates), each of length len(maturities) - 1
+        """
+        m = self.maturities
+        spot = self.get_yields(m)
 
-        return forward_rate
+        # Log accumulation at each node, so each forward rate is one expm1
+        log_growth = m * np.log1p(spot)
+        forward_rates = np.expm1(np.diff(log_growth) / np.diff(m))
+        midpoints = 0.5 * (m[1:] + m[:-1])
+
+        return midpoints, forward_rates
 
     def get_discount_factor(self, maturity: float) -> float:
         """
@@ -162,8 +348,54 @@ class YieldCurve:
         Returns:
             Discount factor
         """
-        spot_rate = self.get_spot_rate(maturity)
-        return (1 + spot_rate) ** (-maturity)
+        discount_factor = self._df_cache.get(maturity)
+        if discount_factor is None:
+            spot_rate = self.get_spot_rate(maturity)
+            discount_factor = (1 + spot_rate) ** (-maturity)
+            self._df_cache[maturity] = discount_factor
+        return discount_factor
+
+    def get_discount_factors(self, maturities: Union[List[float], np.ndarray]) -> np.ndarray:
+        """
+        Calculate discount factors for an array of maturities.
+
+        Uses a single vectorized interpolation and bypasses the scalar cache.
+
+        Args:
+            maturities: Times to maturity in years
+
+        Returns:
+            Array of discount factors
+        """
+        t = np.asarray(maturities, dtype=float)
+        return np.exp(-t * np.log1p(self.get_yields(t)))
+
+    def price_bond_batch(self,
+                         cash_flows_2d: Union[List[List[float]], np.ndarray],
+                         times_2d: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """
+        Price a batch of cash flow streams off this curve.
+
+        Interpolates, discounts and sums in one pass over the times. Rows may be
+        zero-padded to a common length; padded cash flows contribute nothing.
+
+        Args:
+            cash_flows_2d: Cash flows of shape (..., N)
+            times_2d: Cash flow times of the same shape
+
+        Returns:
+            Present value of each stream, of shape (...)
+        """
+        cf = np.asarray(cash_flows_2d, dtype=float)
+        t = np.asarray(times_2d, dtype=float)
+        y = self.get_yields(t.ravel()).reshape(t.shape)
+        discount = np.log1p(y)
+        discount *= -t
+        np.exp(discount, out=discount)
+        # Padding is dropped outright, even where the curve is not finite at the padded time
+        np.copyto(discount, 0.0, where=cf == 0)
+        # Row-wise dot products, without materializing the discounted cash flows
+        return np.einsum('...n,...n->...', cf, discount)
 
     def bootstrap_spot_rates(self) -> Dict[float, float]:
         """
@@ -173,10 +405,8 @@ class YieldCurve:
         Returns:
             Dictionary of maturity -> spot rate
         """
-        spot_rates = {}
-        for maturity, yield_rate in zip(self.maturities, self.yields):
-            spot_rates[maturity] = yield_rate
-        return spot_rates
+        # One bulk conversion to Python floats rather than a dict insert per numpy scalar
+        return dict(zip(self.maturities.tolist(), self.yields.tolist()))
 
     def plot_yield_curve(self, show_forward_rates: bool = False, **kwargs):
         """
@@ -186,24 +416,17 @@ class YieldCurve:
             show_forward_rates: Whether to show forward rate curve
             **kwargs: Additional arguments for plotting
         """
+        # Imported here so that importing the finance module does not load matplotlib
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 6))
 
         # Plot yield curve
         plt.plot(self.maturities, self.yields * 100, 'b-', label='Yield Curve', linewidth=2)
 
         if show_forward_rates:
-            # Calculate and plot forward rates
-            forward_maturities = []
-            forward_rates = []
-
-            for i in range(1, len(self.maturities)):
-                start_t = self.maturities[i-1]
-                end_t = self.maturities[i]
-                forward_rate = self.get_forward_rate(start_t, end_t)
-                forward_maturities.append((start_t + end_t) / 2)
-                forward_rates.append(forward_rate)
-
-            plt.plot(forward_maturities, np.array(forward_rates) * 100, 'r--', label='Forward Rates', linewidth=2)
+            forward_maturities, forward_rates = self.forward_rate_curve()
+            plt.plot(forward_maturities, forward_rates * 100, 'r--', label='Forward Rates', linewidth=2)
 
         plt.xlabel('Maturity (Years)')
         plt.ylabel('Yield (%)')
@@ -0,0 +1,82 @@
+"""
+Life Kernels
+
+Numba-compiled accumulation loops for two-life contingencies and reserves.
+The kernels take survival probabilities already extracted from the mortality
+table as float64 arrays, so the loop itself touches no Python objects;
+callers should only dispatch to them when NUMBA_AVAILABLE is True and keep
+their NumPy implementation as the fallback.
+"""
+
+import math
+
+import numpy as np
+
+from .._compat import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def _contingent_assurance(v, npx_x, npx_y):
+    """Sum of v^t * ((t-1)p_x - tp_x) * tp_y for t = 1..len(npx_x)."""
+    acc = 0.0
+    v_t = v
+    prev = 1.0
+    for k in range(npx_x.shape[0]):
+        acc += v_t * (prev - npx_x[k]) * npx_y[k]
+        prev = npx_x[k]
+        v_t *= v
+    return acc
+
+
+@njit(cache=True, fastmath=True)
+def _contingent_annuity(v, npx_x, npx_y_prev):
+    """Sum of v^(t-1) * tp_x * (1 - (t-1)p_y) for t = 1..len(npx_x)."""
+    acc = 0.0
+    v_t = 1.0
+    for k in range(npx_x.shape[0]):
+        acc += v_t * npx_x[k] * (1.0 - npx_y_prev[k])
+        v_t *= v
+    return acc
+
+
+@njit(cache=True, fastmath=True)
+def _retrospective_reserve(tpx, i, annual_premium, sum_assured):
+    """Accumulated premiums less death claims over len(tpx) - 1 years."""
+    premiums = 0.0
+    claims = 0.0
+    acc = 1.0
+    one_plus_i = 1.0 + i
+    for t in range(tpx.shape[0] - 1):
+        premiums += annual_premium * tpx[t] * acc
+        claims += (tpx[t] - tpx[t + 1]) * sum_assured * acc
+        acc *= one_plus_i
+    return max(0.0, premiums - claims)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _prospective_whole_life_batch(start, cum_log_px, cum_certain_deaths, v_pow,
+                                  annual_premium, sum_assured):
+    """Whole life reserves for policies at table rows start, one policy per thread."""
+    n_ages = cum_log_px.shape[0] - 1
+    out = np.empty(start.shape[0])
+    for k in prange(start.shape[0]):
+        j = start[k]
+        assurance = 0.0
+        annuity = 1.0
+        prev = 1.0
+        for t in range(1, n_ages - j):
+            if cum_certain_deaths[j + t] > cum_certain_deaths[j]:
+                tpx = 0.0
+            else:
+                tpx = math.exp(cum_log_px[j + t] - cum_log_px[j])
+            assurance += v_pow[t] * (prev - tpx)
+            annuity += v_pow[t] * tpx
+            prev = tpx
+
+        assurance *= sum_assured[k]
+        annuity -= 1.0  # Immediate annuity
+        if annuity == 0.0:
+            out[k] = assurance - annual_premium[k]
+        else:
+            out[k] = max(0.0, (assurance - annual_premium[k] * annuity) / annuity)
+    return out
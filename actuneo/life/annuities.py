@@ -5,9 +5,11 @@ Provides comprehensive annuity calculations including immediate annuities,
 annuities-due, life annuities, and various annuity forms.
 """
 
+import math
 import numpy as np
 from typing import Optional, Union, List
 from ..mortality import MortalityTable, SurvivalFunctions
+from ._kernels import NUMBA_AVAILABLE, _contingent_annuity
 
 
 class Annuities:
@@ -26,10 +28,111 @@ class Annuities:
             interest_rate: Annual interest rate for discounting
         """
         self.mt = mortality_table
-        if mortality_table:
-            self.sf = SurvivalFunctions(mortality_table, interest_rate)
         self.i = interest_rate
+
+    @property
+    def i(self) -> float:
+        """Annual interest rate; setting it rebuilds every rate-dependent value."""
+        return self._i
+
+    @i.setter
+    def i(self, interest_rate: float):
+        self._i = interest_rate
+        if self.mt:
+            self.sf = SurvivalFunctions(self.mt, interest_rate)
         self.v = 1 / (1 + interest_rate)
+        self._log_v = -math.log1p(interest_rate)
+        # Discount factors v^t for integer t = 0..120
+        self.v_pow = self.v ** np.arange(0, 121)
+        # Memoized unit annuity values keyed by (function, age, term); valid until
+        # the interest rate is next replaced
+        self._cache = {}
+        # Commutation columns for single-year tables, N padded with a zero for the
+        # age after the table end; None when there is no table or it has age gaps
+        self._D = self._N = None
+        if self.mt and self.sf._contiguous:
+            columns = self.sf.commutation_columns()
+            self._D = columns['D']
+            self._N = np.append(columns['N'], 0.0)
+            self._age0 = int(self.mt.ages[0])
+            self._last_age = int(self.mt.ages[-1])
+
+        self._bind_certain_annuities()
+
+    def _bind_certain_annuities(self):
+        """
+        Specialise immediate_annuity and annuity_due for this instance's rate.
+
+        The zero-rate test is made once here, whenever the rate is set,
+        and the per-call versions close over 1/i and log(v) instead of branching
+        and looking up attributes. 1 - v^n is evaluated as -expm1(n log v), which
+        costs the same as a pow and keeps full precision for short terms. The
+        class methods remain the reference definitions.
+        """
+        if self.i == 0:
+            def immediate_annuity(periods: int, payment: float = 1.0) -> float:
+                return payment * periods
+
+            annuity_due = immediate_annuity
+        else:
+            log_v = self._log_v
+            expm1 = math.expm1
+            inv_i = 1.0 / self.i
+            due_factor = inv_i * (1 + self.i)
+
+            def immediate_annuity(periods: int, payment: float = 1.0) -> float:
+                return -payment * expm1(log_v * periods) * inv_i
+
+            def annuity_due(periods: int, payment: float = 1.0) -> float:
+                return -payment * expm1(log_v * periods) * due_factor
+
+        immediate_annuity.__doc__ = Annuities.immediate_annuity.__doc__
+        annuity_due.__doc__ = Annuities.annuity_due.__doc__
+        self.immediate_annuity = immediate_annuity
+        self.annuity_due = annuity_due
+
+    def _v_power(self, n: int) -> float:
+        """Return v^n, read from the precomputed table for integer terms up to 120."""
+        if isinstance(n, (int, np.integer)) and 0 <= n < len(self.v_pow):
+            return float(self.v_pow[n])
+        return self.v ** n
+
+    def _v_powers(self, t: np.ndarray) -> np.ndarray:
+        """Return v^t for an array of integer terms, gathered from v_pow where it is long enough."""
+        if t.size and 0 <= t.min() and t.max() < len(self.v_pow):
+            return self.v_pow[t]
+        return self.v ** t
+
+    def _memo(self, key: tuple, compute) -> float:
+        """Return the cached value for key, computing and storing it on first use."""
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            self._cache[key] = value
+        return value
+
+    def _unit_annuity_due(self, x: int, n: Optional[int] = None) -> float:
+        """Unit life annuity-due, read from the commutation columns where they cover the term."""
+        if (self._N is not None and isinstance(x, (int, np.integer))
+                and self._age0 <= x <= self._last_age and self._D[x - self._age0] > 0):
+            idx = int(x - self._age0)
+            if n is None:
+                return float(self._N[idx] / self._D[idx])
+            if isinstance(n, (int, np.integer)) and 0 <= n and x + n <= self._last_age + 1:
+                return float((self._N[idx] - self._N[idx + n]) / self._D[idx])
+
+        key = ('a_due', x) if n is None else ('a_due', x, n)
+        return self._memo(key, lambda: self.sf.annuity_due(x, n))
+
+    def _unit_annuity_immediate(self, x: int, n: int) -> float:
+        """Unit temporary immediate life annuity, paying at the end of years 1..n."""
+        if (self._N is not None and isinstance(x, (int, np.integer))
+                and self._age0 <= x <= self._last_age and self._D[x - self._age0] > 0
+                and isinstance(n, (int, np.integer)) and 0 <= n and x + n <= self._last_age):
+            idx = int(x - self._age0)
+            return float((self._N[idx + 1] - self._N[idx + n + 1]) / self._D[idx])
+
+        return self._memo(('a_imm', x, n), lambda: self.sf.annuity_immediate(x, n))
 
     def immediate_annuity(self,
                          periods: int,
@@ -47,7 +150,7 @@ class Annuities:
         if self.i == 0:
             return payment * periods
 
-        return payment * ((1 - self.v ** periods) / self.i)
+        return payment * ((1 - self._v_power(periods)) / self.i)
 
     def annuity_due(self,
                    periods: int,
@@ -65,7 +168,7 @@ class Annuities:
         if self.i == 0:
             return payment * periods
 
-        return payment * ((1 - self.v ** periods) / self.i) * (1 + self.i)
+        return payment * ((1 - self._v_power(periods)) / self.i) * (1 + self.i)
 
     def life_annuity_immediate(self,
                               x: int,
@@ -83,7 +186,7 @@ class Annuities:
         if not self.mt:
             raise ValueError("Mortality table required for life annuities")
 
-        return payment * self.sf.annuity_immediate(x)
+        return payment * (self._unit_annuity_due(x) - 1.0)
 
     def life_annuity_due(self,
                         x: int,
@@ -101,7 +204,7 @@ class Annuities:
         if not self.mt:
             raise ValueError("Mortality table required for life annuities")
 
-        return payment * self.sf.annuity_due(x)
+        return payment * self._unit_annuity_due(x)
 
     def temporary_life_annuity_immediate(self,
                                         x: int,
@@ -121,7 +224,7 @@ class Annuities:
         if not self.mt:
             raise ValueError("Mortality table required for life annuities")
 
-        return payment * self.sf.annuity_immediate(x, n)
+        return payment * self._unit_annuity_immediate(x, n)
 
     def temporary_life_annuity_due(self,
                                   x: int,
@@ -141,7 +244,7 @@ class Annuities:
         if not self.mt:
             raise ValueError("Mortality table required for life annuities")
 
-        return payment * self.sf.annuity_due(x, n)
+        return payment * self._unit_annuity_due(x, n)
 
     def deferred_life_annuity(self,
                              x: int,
@@ -165,7 +268,7 @@ class Annuities:
         survival_prob = self.sf.npx(x, u)
         annuity_value = self.life_annuity_immediate(x + u, payment)
 
-        return survival_prob * self.v ** u * annuity_value
+        return survival_prob * self._v_power(u) * annuity_value
 
     def guaranteed_annuity(self,
                           x: int,
@@ -209,12 +312,24 @@ class Annuities:
         if not self.mt:
             raise ValueError("Mortality table required for life annuities")
 
-        # Simplified calculation - in practice needs joint mortality tables
-        annuity_x = self.life_annuity_immediate(x, payment)
-        annuity_y = self.life_annuity_immediate(y, payment)
+        # Independent lives: the annuity pays while either life survives
+        t, px, py = self._joint_survival(x, y)
+        last_survivor = px + py - px * py
+
+        return float(payment * np.dot(self._v_powers(t), last_survivor))
 
-        # Rough approximation for last survivor annuity
-        return annuity_x + annuity_y - min(annuity_x, annuity_y) * 0.7
+    def _joint_survival(self, x: int, y: int):
+        """
+        Survival probabilities of (x) and (y) for t = 1 up to the table end for the younger life.
+
+        As in the single-life whole life functions, a life is treated as dead once
+        its attained age passes the last age in the table.
+        """
+        last_age = int(self.mt.ages[-1])
+        t = np.arange(1, last_age - min(x, y) + 1)
+        px = self.sf.npx_array(x, t) * (x + t <= last_age)
+        py = self.sf.npx_array(y, t) * (y + t <= last_age)
+        return t, px, py
 
     def contingent_annuity(self,
                           x: int,
@@ -237,19 +352,18 @@ class Annuities:
         # Contingent annuity pays while (x) is alive and (y) has died
         # This is a simplified calculation
 
-        annuity = 0.0
-        v_t = 1.0
-
         # Approximate calculation for ages up to 100
-        for t in range(1, 81):  # Reasonable maximum
-            # Probability (x) survives to t and (y) dies before t
-            px = self.sf.npx(x, t)
-            qy_t = 1 - self.sf.npx(y, t-1)  # Approximate
+        t = np.arange(1, 81)  # Reasonable maximum
+
+        # Probability (x) survives to t and (y) dies before t
+        px = self.sf.npx_array(x, t)
+        py_prev = self.sf.npx_array(y, t - 1)
 
-            annuity += v_t * px * qy_t * payment
-            v_t *= self.v
+        if NUMBA_AVAILABLE:
+            return float(payment * _contingent_annuity(float(self.v), px, py_prev))
 
-        return annuity
+        qy_t = 1 - py_prev  # Approximate
+        return float(payment * np.dot(self.v_pow[t - 1] * px, qy_t))
 
     def increasing_annuity(self,
                           periods: int,
@@ -266,16 +380,19 @@ class Annuities:
         Returns:
             Present value of increasing annuity
         """
-        if self.i == increase_rate:
+        # Geometric series: sum of payment * (1+g)^(t-1) * v^t for t = 1..periods
+        ratio = (1 + increase_rate) * self.v
+        if ratio <= 0:
+            return payment * self.v * (1 - ratio ** periods) / (1 - ratio)
+
+        # With ratio = exp(log_ratio) the sum is v * expm1(n log_ratio) / expm1(log_ratio),
+        # which stays accurate when the increase rate is close to the interest rate
+        log_ratio = math.log1p(increase_rate) - math.log1p(self.i)
+        if abs(log_ratio) < 1e-14:
             # Special case when interest rate equals increase rate
             return payment * periods * self.v
 
-        total_pv = 0.0
-        for t in range(1, periods + 1):
-            payment_t = payment * ((1 + increase_rate) ** (t - 1))
-            total_pv += payment_t * self.v ** t
-
-        return total_pv
+        return payment * self.v * math.expm1(periods * log_ratio) / math.expm1(log_ratio)
 
     def decreasing_annuity(self,
                           periods: int,
@@ -292,17 +409,19 @@ class Annuities:
         Returns:
             Present value of decreasing annuity
         """
-        total_pv = 0.0
-        for t in range(1, periods + 1):
-            payment_t = payment * (decrease_rate ** (t - 1))
-            total_pv += payment_t * self.v ** t
+        # Geometric series: sum of payment * d^(t-1) * v^t for t = 1..periods
+        ratio = decrease_rate * self.v
+
+        if ratio == 1:
+            return payment * periods * self.v
 
-        return total_pv
+        return payment * self.v * (1 - ratio ** periods) / (1 - ratio)
 
     def annuity_with_withdrawal(self,
                                principal: float,
                                withdrawal_rate: float,
-                               periods: Optional[int] = None) -> dict:
+                               periods: Optional[int] = None,
+                               as_dicts: bool = False) -> dict:
         """
         Calculate annuity payments from principal with systematic withdrawals.
 
@@ -310,9 +429,14 @@ class Annuities:
             principal: Initial principal amount
             withdrawal_rate: Annual withdrawal rate (decimal)
             periods: Number of periods (None for perpetual)
+            as_dicts: Return the schedule as a list of per-period dictionaries
 
         Returns:
-            Dictionary with payment amount, remaining principal, etc.
+            Dictionary with payment amount, remaining principal, etc. For finite
+            periods 'schedule' is a NumPy record array with fields period,
+            starting_balance, interest, withdrawal and ending_balance (accessible
+            as schedule.interest or schedule['interest']), or a list of dicts
+            with the same keys when as_dicts is True
         """
         if periods is None:
             # Perpetual annuity
@@ -325,24 +449,34 @@ class Annuities:
         else:
             # Finite periods
             payment = principal * (withdrawal_rate / (1 - (1 + withdrawal_rate - self.i) ** (-periods)))
-            remaining = principal
-
-            schedule = []
-            for t in range(1, periods + 1):
-                interest = remaining * self.i
-                withdrawal = payment
-                remaining = remaining + interest - withdrawal
-                schedule.append({
-                    'period': t,
-                    'starting_balance': remaining + withdrawal - interest,
-                    'interest': interest,
-                    'withdrawal': withdrawal,
-                    'ending_balance': remaining
-                })
+
+            # Balance after t withdrawals solves B_t = B_{t-1} * (1 + i) - payment
+            t = np.arange(periods + 1)
+            if self.i == 0:
+                balances = principal - payment * t
+            else:
+                level = payment / self.i
+                balances = (principal - level) * (1 + self.i) ** t + level
+
+            schedule = np.empty(periods, dtype=[('period', 'i4'),
+                                                ('starting_balance', 'f8'),
+                                                ('interest', 'f8'),
+                                                ('withdrawal', 'f8'),
+                                                ('ending_balance', 'f8')])
+            schedule['period'] = t[1:]
+            schedule['starting_balance'] = balances[:-1]
+            schedule['interest'] = balances[:-1] * self.i
+            schedule['withdrawal'] = payment
+            schedule['ending_balance'] = balances[1:]
+            schedule = schedule.view(np.recarray)
+
+            if as_dicts:
+                names = schedule.dtype.names
+                schedule = [dict(zip(names, row)) for row in schedule.tolist()]
 
             return {
                 'annual_payment': payment,
-                'remaining_principal': remaining,
+                'remaining_principal': float(balances[-1]),
                 'periods': periods,
                 'schedule': schedule
             }
@@ -6,8 +6,9 @@ whole life, term life, endowment assurance, and related products.
 """
 
 import numpy as np
-from typing import Optional, Union
+from typing import Optional, Union, List, Tuple
 from ..mortality import MortalityTable, SurvivalFunctions
+from ._kernels import NUMBA_AVAILABLE, _contingent_assurance
 
 
 class LifeAssurance:
@@ -28,10 +29,82 @@ class LifeAssurance:
             expense_loading: Expense loading as percentage of premium
         """
         self.mt = mortality_table
-        self.sf = SurvivalFunctions(mortality_table, interest_rate)
+        self.expense_loading = expense_loading
         self.i = interest_rate
+
+    @property
+    def i(self) -> float:
+        """Annual interest rate; setting it rebuilds every rate-dependent value."""
+        return self._i
+
+    @i.setter
+    def i(self, interest_rate: float):
+        self._i = interest_rate
+        self.sf = SurvivalFunctions(self.mt, interest_rate)
         self.v = 1 / (1 + interest_rate)
-        self.expense_loading = expense_loading
+        # Discount factors v^t for integer t = 0..120
+        self.v_pow = self.v ** np.arange(0, 121)
+        # Memoized actuarial values keyed by (function, age, term); valid until the
+        # interest rate is next replaced
+        self._cache = {}
+        # Whole life A_x and a_x for every table age, built on first vectorized use
+        self._A_table = None
+        self._a_table = None
+        self._setup_commutation()
+
+    def _setup_commutation(self):
+        """
+        Keep commutation columns for O(1) valuation on single-year tables.
+
+        N is padded with a zero for the age after the table end, so annuities
+        paying up to the last age can be read directly. Tables with age gaps
+        leave self._D as None and use the survival functions.
+        """
+        self._age0 = int(self.mt.ages[0])
+        self._last_age = int(self.mt.ages[-1])
+        if self.sf._contiguous:
+            columns = self.sf.commutation_columns()
+            self._D = columns['D']
+            self._N = np.append(columns['N'], 0.0)
+            self._M = columns['M']
+        else:
+            self._D = self._N = self._M = None
+
+    def _commutation_index(self, x: int, n: int = 0, max_end: Optional[int] = None) -> Optional[int]:
+        """
+        Return the table position of age x if x and x+n are covered by the columns, else None.
+
+        max_end defaults to one year past the last table age.
+        """
+        if self._D is None or not isinstance(x, (int, np.integer)) or not isinstance(n, (int, np.integer)):
+            return None
+        if max_end is None:
+            max_end = self._last_age + 1
+        if n < 0 or not self._age0 <= x <= self._last_age or x + n > max_end:
+            return None
+        idx = int(x - self._age0)
+        # Ages no one survives to carry no exposure to divide by
+        return idx if self._D[idx] > 0 else None
+
+    def _v_power(self, n: int) -> float:
+        """Return v^n, read from the precomputed table for integer terms up to 120."""
+        if isinstance(n, (int, np.integer)) and 0 <= n < len(self.v_pow):
+            return float(self.v_pow[n])
+        return self.v ** n
+
+    def _v_powers(self, t: np.ndarray) -> np.ndarray:
+        """Return v^t for an array of integer terms, gathered from v_pow where it is long enough."""
+        if t.size and 0 <= t.min() and t.max() < len(self.v_pow):
+            return self.v_pow[t]
+        return self.v ** t
+
+    def _memo(self, key: tuple, compute) -> float:
+        """Return the cached value for key, computing and storing it on first use."""
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            self._cache[key] = value
+        return value
 
     def whole_life_assurance(self, x: int, discrete: bool = True) -> float:
         """
@@ -44,7 +117,11 @@ class LifeAssurance:
         Returns:
             Net single premium for whole life assurance
         """
-        return self.sf.assurance(x)
+        idx = self._commutation_index(x)
+        if idx is not None:
+            # Deaths in the table's final year fall outside the whole life range
+            return float((self._M[idx] - self._M[-1]) / self._D[idx])
+        return self._memo(('A', x), lambda: self.sf.assurance(x))
 
     def term_assurance(self, x: int, n: int, discrete: bool = True) -> float:
         """
@@ -58,7 +135,10 @@ class LifeAssurance:
         Returns:
             Net single premium for n-year term assurance
         """
-        return self.sf.assurance(x, n)
+        idx = self._commutation_index(x, n, max_end=self._last_age)
+        if idx is not None:
+            return float((self._M[idx] - self._M[idx + n]) / self._D[idx])
+        return self._memo(('A', x, n), lambda: self.sf.assurance(x, n))
 
     def endowment_assurance(self, x: int, n: int) -> float:
         """
@@ -88,8 +168,10 @@ class LifeAssurance:
         Returns:
             Net single premium for pure endowment
         """
-        survival_prob = self.sf.npx(x, n)
-        return survival_prob * self.v ** n
+        idx = self._commutation_index(x, n, max_end=self._last_age)
+        if idx is not None:
+            return float(self._D[idx + n] / self._D[idx])
+        return self._memo(('E', x, n), lambda: self.sf.npx(x, n) * self._v_power(n))
 
     def deferred_assurance(self, x: int, u: int, n: int) -> float:
         """
@@ -112,7 +194,7 @@ class LifeAssurance:
         # Calculate assurance from age x+u for n years
         deferred_assurance = self.term_assurance(x + u, n)
 
-        return survival_to_deferment * self.v ** u * deferred_assurance
+        return survival_to_deferment * self._v_power(u) * deferred_assurance
 
     def temporary_life_annuity(self, x: int, n: int) -> float:
         """
@@ -125,7 +207,11 @@ class LifeAssurance:
         Returns:
             Net single premium for temporary life annuity
         """
-        return self.sf.annuity_immediate(x, n)
+        # Payments at the end of years 1..n: (N_{x+1} - N_{x+n+1}) / D_x
+        idx = self._commutation_index(x, n, max_end=self._last_age)
+        if idx is not None:
+            return float((self._N[idx + 1] - self._N[idx + n + 1]) / self._D[idx])
+        return self._memo(('a', x, n), lambda: self.sf.annuity_immediate(x, n))
 
     def whole_life_annuity(self, x: int) -> float:
         """
@@ -137,7 +223,10 @@ class LifeAssurance:
         Returns:
             Net single premium for whole life annuity
         """
-        return self.sf.annuity_immediate(x)
+        idx = self._commutation_index(x)
+        if idx is not None:
+            return float(self._N[idx] / self._D[idx]) - 1.0
+        return self._memo(('a', x), lambda: self.sf.annuity_immediate(x))
 
     def contingent_assurance(self, x: int, y: int, n: int) -> float:
         """
@@ -154,22 +243,25 @@ class LifeAssurance:
         # This is a simplified calculation assuming independent lives
         # In practice, this would require joint life mortality tables
 
-        assurance = 0.0
-        v_t = self.v
+        t = np.arange(1, n + 1)
+        npx_x = self.sf.npx_array(x, t)
+        py_t = self.sf.npx_array(y, t)
 
-        for t in range(1, n + 1):
-            # Probability that (x) dies in year t and (y) survives to t
-            qx_t = 1 - self.sf.npx(x, t) + self.sf.npx(x, t-1)  # Approximate
-            py_t = self.sf.npx(y, t)
+        if NUMBA_AVAILABLE:
+            return float(_contingent_assurance(float(self.v), npx_x, py_t))
 
-            assurance += v_t * qx_t * py_t
-            v_t *= self.v
+        # Probability that (x) dies in year t and (y) survives to t
+        npx_x_prev = np.concatenate(([1.0], npx_x[:-1]))
+        qx_t = npx_x_prev - npx_x
 
-        return assurance
+        return float(np.dot(self._v_powers(t), qx_t * py_t))
 
     def joint_life_assurance(self, x: int, y: int) -> float:
         """
-        Calculate net single premium for joint life assurance.
+        Calculate net single premium for joint life assurance (last survivor).
+
+        Assumes independent lives; the benefit is paid at the end of the year
+        in which the second death occurs.
 
         Args:
             x: Age of first life
@@ -178,10 +270,16 @@ class LifeAssurance:
         Returns:
             Net single premium for joint life assurance
         """
-        # Simplified calculation - in practice needs joint mortality
-        min_age = min(x, y)
-        assurance = self.whole_life_assurance(min_age) * 0.8  # Rough approximation
-        return assurance
+        last_age = int(self.mt.ages[-1])
+        t = np.arange(1, last_age - min(x, y) + 1)
+        px = self.sf.npx_array(x, t) * (x + t <= last_age)
+        py = self.sf.npx_array(y, t) * (y + t <= last_age)
+
+        # Probability that both lives have died by time t, and its yearly increments
+        both_dead = (1 - px) * (1 - py)
+        second_death = np.diff(both_dead, prepend=0.0)
+
+        return float(np.dot(self._v_powers(t), second_death))
 
     def gross_premium(self, net_premium: float, initial_expenses: float = 0.0) -> float:
         """
@@ -218,6 +316,29 @@ class LifeAssurance:
         net_annual = net_single_premium / annuity_factor
         return net_annual * (1 + gross_margin)
 
+    def whole_life_premium(self, x: int) -> float:
+        """
+        Calculate net annual premium for whole life assurance.
+
+        Same as annual_premium(whole_life_assurance(x), whole_life_annuity(x)),
+        but computed from one read of the commutation columns, or one pass over
+        the survival probabilities when the columns do not apply.
+
+        Args:
+            x: Age at entry
+
+        Returns:
+            Net annual premium per unit sum assured
+        """
+        idx = self._commutation_index(x)
+        if idx is not None:
+            # A_x / a_x = (M_x - M_omega) / (N_x - D_x)
+            annuity = self._N[idx] - self._D[idx]
+            return float((self._M[idx] - self._M[-1]) / annuity) if annuity != 0 else 0.0
+
+        assurance, annuity_due = self.sf.assurance_and_annuity(x)
+        return self.annual_premium(assurance, annuity_due - 1.0)
+
     def reserve_whole_life(self, x: int, duration: int) -> float:
         """
         Calculate prospective reserve for whole life assurance.
@@ -293,3 +414,208 @@ class LifeAssurance:
             return remaining_endowment
 
         return remaining_endowment / remaining_annuity
+
+    def _whole_life_tables(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return whole life assurance and annuity values aligned to the table ages."""
+        if self._A_table is None:
+            if self._D is not None and np.all(self._D > 0):
+                self._A_table = (self._M - self._M[-1]) / self._D
+                self._a_table = self._N[:-1] / self._D - 1.0
+            else:
+                ages = self.mt.ages
+                self._A_table = np.array([self.whole_life_assurance(int(age)) for age in ages])
+                self._a_table = np.array([self.whole_life_annuity(int(age)) for age in ages])
+        return self._A_table, self._a_table
+
+    def _age_index(self, ages: np.ndarray) -> np.ndarray:
+        """Map ages to positions in the mortality table."""
+        table_ages = self.mt.ages
+        idx = np.searchsorted(table_ages, ages)
+        found = table_ages[np.minimum(idx, len(table_ages) - 1)] == ages
+        if not np.all((idx < len(table_ages)) & found):
+            raise ValueError("All attained ages must be in the mortality table")
+        return idx
+
+    def _unique_term_values(self,
+                            current_age: np.ndarray,
+                            remaining_term: np.ndarray,
+                            scalar_func) -> np.ndarray:
+        """
+        Evaluate scalar_func once per distinct (age, term) pair of in-force policies.
+
+        Matured policies (remaining_term <= 0) get zero.
+        """
+        result = np.zeros(current_age.shape)
+        active = remaining_term > 0
+        if not np.any(active):
+            return result
+
+        pairs, inverse = np.unique(np.stack([current_age[active], remaining_term[active]]),
+                                   axis=1, return_inverse=True)
+        values = np.array([scalar_func(int(age), int(term)) for age, term in pairs.T])
+        result[active] = values[inverse.ravel()]
+        return result
+
+    def reserve_whole_life_vec(self,
+                               x: Union[int, List[int], np.ndarray],
+                               duration: Union[int, List[int], np.ndarray]) -> np.ndarray:
+        """
+        Calculate whole life reserves for arrays of entry ages and durations.
+
+        Equivalent to reserve_whole_life element by element; inputs are broadcast.
+
+        Args:
+            x: Original ages at entry
+            duration: Numbers of years policies have been in force
+
+        Returns:
+            Array of prospective reserves
+        """
+        current_age = np.asarray(x) + np.asarray(duration)
+        A_table, a_table = self._whole_life_tables()
+
+        idx = self._age_index(current_age)
+        assurance = A_table[idx]
+        annuity = a_table[idx]
+
+        return np.where(annuity == 0, assurance, assurance / np.where(annuity == 0, 1.0, annuity))
+
+    def reserve_term_vec(self,
+                         x: Union[int, List[int], np.ndarray],
+                         n: Union[int, List[int], np.ndarray],
+                         duration: Union[int, List[int], np.ndarray]) -> np.ndarray:
+        """
+        Calculate term assurance reserves for arrays of policies.
+
+        Each distinct (attained age, remaining term) pair is valued once.
+
+        Args:
+            x: Original ages at entry
+            n: Original terms
+            duration: Numbers of years policies have been in force
+
+        Returns:
+            Array of prospective reserves
+        """
+        current_age, remaining_term = np.broadcast_arrays(np.asarray(x) + np.asarray(duration),
+                                                          np.asarray(n) - np.asarray(duration))
+        return self._unique_term_values(current_age, remaining_term,
+                                        lambda age, term: self.reserve_term(age, term, 0))
+
+    def reserve_endowment_vec(self,
+                              x: Union[int, List[int], np.ndarray],
+                              n: Union[int, List[int], np.ndarray],
+                              duration: Union[int, List[int], np.ndarray]) -> np.ndarray:
+        """
+        Calculate endowment assurance reserves for arrays of policies.
+
+        Each distinct (attained age, remaining term) pair is valued once.
+
+        Args:
+            x: Original ages at entry
+            n: Original terms
+            duration: Numbers of years policies have been in force
+
+        Returns:
+            Array of prospective reserves
+        """
+        current_age, remaining_term = np.broadcast_arrays(np.asarray(x) + np.asarray(duration),
+                                                          np.asarray(n) - np.asarray(duration))
+        return self._unique_term_values(current_age, remaining_term,
+                                        lambda age, term: self.reserve_endowment(age, term, 0))
+
+    def annual_premium_vec(self,
+                           x: Union[int, List[int], np.ndarray],
+                           n: Optional[Union[int, List[int], np.ndarray]] = None,
+                           product: str = 'term') -> np.ndarray:
+        """
+        Calculate net annual premiums for arrays of policies.
+
+        Equivalent to annual_premium(single premium, annuity factor) element by
+        element, with the whole life or temporary life annuity as the factor.
+
+        Args:
+            x: Ages at entry
+            n: Terms in years (ignored for whole life)
+            product: 'whole_life', 'term' or 'endowment'
+
+        Returns:
+            Array of net annual premiums
+        """
+        if product == 'whole_life':
+            A_table, a_table = self._whole_life_tables()
+            idx = self._age_index(np.asarray(x))
+            annuity = a_table[idx]
+            return np.where(annuity == 0, 0.0, A_table[idx] / np.where(annuity == 0, 1.0, annuity))
+
+        if product == 'term':
+            single_premium = self.term_assurance
+        elif product == 'endowment':
+            single_premium = self.endowment_assurance
+        else:
+            raise ValueError(f"Unknown product: {product}")
+
+        if n is None:
+            raise ValueError(f"n is required for {product} premiums")
+
+        ages, terms = np.broadcast_arrays(np.asarray(x), np.asarray(n))
+        return self._unique_term_values(
+            ages, terms,
+            lambda age, term: self.annual_premium(single_premium(age, term),
+                                                  self.temporary_life_annuity(age, term)))
+
+    def gross_premium_batch(self,
+                            x: Union[int, List[int], np.ndarray],
+                            n: Optional[Union[int, List[int], np.ndarray]] = None,
+                            initial_expenses: Union[float, np.ndarray] = 0.0,
+                            product: str = 'term') -> np.ndarray:
+        """
+        Calculate gross annual premiums for arrays of policies.
+
+        Args:
+            x: Ages at entry
+            n: Terms in years (ignored for whole life)
+            initial_expenses: Initial expense loading per policy
+            product: 'whole_life', 'term' or 'endowment'
+
+        Returns:
+            Array of gross premiums
+        """
+        net_premium = self.annual_premium_vec(x, n, product)
+        return net_premium * (1 + self.expense_loading) + initial_expenses
+
+    def valuate_portfolio(self,
+                          policies,
+                          product: str = 'term',
+                          age_col: str = 'age',
+                          term_col: str = 'term',
+                          duration_col: str = 'duration'):
+        """
+        Value a portfolio of policies held in a DataFrame.
+
+        Args:
+            policies: pandas DataFrame with one row per policy
+            product: 'whole_life', 'term' or 'endowment'
+            age_col: Column name for ages at entry
+            term_col: Column name for terms (not needed for whole life)
+            duration_col: Column name for years in force
+
+        Returns:
+            Copy of the DataFrame with net_premium, gross_premium and reserve columns
+        """
+        x = policies[age_col].to_numpy()
+        duration = policies[duration_col].to_numpy()
+        n = policies[term_col].to_numpy() if product != 'whole_life' else None
+
+        net_premium = self.annual_premium_vec(x, n, product)
+
+        if product == 'whole_life':
+            reserve = self.reserve_whole_life_vec(x, duration)
+        elif product == 'term':
+            reserve = self.reserve_term_vec(x, n, duration)
+        else:
+            reserve = self.reserve_endowment_vec(x, n, duration)
+
+        return policies.assign(net_premium=net_premium,
+                               gross_premium=net_premium * (1 + self.expense_loading),
+                               reserve=reserve)
@@ -8,6 +8,7 @@ and related actuarial valuations.
 import numpy as np
 from typing import Optional, Union, List, Dict
 from ..mortality import MortalityTable, SurvivalFunctions
+from ._kernels import NUMBA_AVAILABLE, _prospective_whole_life_batch, _retrospective_reserve
 
 
 class Reserves:
@@ -35,6 +36,33 @@ class Reserves:
         self.v = 1 / (1 + interest_rate)
         self.expense_rate = expense_rate
         self.profit_margin = profit_margin
+        # Whole life A_x and immediate annuity a_x for every table age, built on first use
+        self._A_table = None
+        self._a_table = None
+
+    def _whole_life_tables(self):
+        """Return whole life assurance and immediate annuity values aligned to the table ages."""
+        if self._A_table is None:
+            columns = self.sf.commutation_columns() if self.sf._contiguous else None
+            if columns is not None and np.all(columns['D'] > 0):
+                # Reverse cumulative sums give every age in O(n): A_x = (M_x - M_w) / D_x
+                # (whole life stops before the last age's deaths) and a_x = N_x / D_x - 1
+                D, N, M = columns['D'], columns['N'], columns['M']
+                self._A_table = (M - M[-1]) / D
+                self._a_table = N / D - 1.0
+            else:
+                ages = self.mt.ages
+                self._A_table = self.sf.assurance_batch(ages)
+                self._a_table = self.sf.annuity_due_batch(ages) - 1.0
+        return self._A_table, self._a_table
+
+    def _whole_life_values(self, age: int):
+        """Return (A_x, a_x) for one attained age, read from the per-age tables."""
+        idx = self.mt._age_to_idx.get(age)
+        if idx is None:
+            return self.sf.assurance(age), self.sf.annuity_immediate(age)
+        A_table, a_table = self._whole_life_tables()
+        return float(A_table[idx]), float(a_table[idx])
 
     def prospective_reserve_whole_life(self,
                                      x: int,
@@ -58,8 +86,8 @@ class Reserves:
         # Reserve = (A_{x+t} * sum_assured - P * ä_{x+t}) / ä_{x+t}
         # Where A is whole life assurance, ä is life annuity, P is annual premium
 
-        remaining_assurance = self.sf.assurance(current_age) * sum_assured
-        remaining_annuity = self.sf.annuity_immediate(current_age)
+        assurance, remaining_annuity = self._whole_life_values(current_age)
+        remaining_assurance = assurance * sum_assured
 
         if remaining_annuity == 0:
             return remaining_assurance - annual_premium
@@ -68,6 +96,68 @@ class Reserves:
 
         return max(0, reserve)  # Reserve cannot be negative
 
+    def prospective_reserve_whole_life_batch(
+            self,
+            x: Union[List[int], np.ndarray],
+            duration: Union[int, List[int], np.ndarray],
+            annual_premium: Union[float, List[float], np.ndarray],
+            sum_assured: Union[float, List[float], np.ndarray] = 1000.0) -> np.ndarray:
+        """
+        Calculate prospective whole life reserves for a portfolio of policies.
+
+        Equivalent to prospective_reserve_whole_life element by element; all
+        inputs are broadcast.
+
+        Args:
+            x: Original ages at entry
+            duration: Numbers of years in force
+            annual_premium: Annual premium amounts
+            sum_assured: Sum assured amounts
+
+        Returns:
+            Array of prospective reserves
+        """
+        current_age = np.asarray(x, dtype=int) + np.asarray(duration, dtype=int)
+        annual_premium = np.asarray(annual_premium, dtype=float)
+        sum_assured = np.asarray(sum_assured, dtype=float)
+
+        if NUMBA_AVAILABLE and self.sf._contiguous:
+            return self._prospective_whole_life_compiled(current_age, annual_premium, sum_assured)
+
+        A_table, a_table = self._whole_life_tables()
+        ages = self.mt.ages
+        idx = np.minimum(np.searchsorted(ages, current_age), len(ages) - 1)
+        if not np.all(ages[idx] == current_age):
+            raise ValueError("All ages must be in the mortality table")
+
+        remaining_assurance = A_table[idx] * sum_assured
+        remaining_annuity = a_table[idx]
+
+        no_annuity = remaining_annuity == 0
+        reserve = ((remaining_assurance - annual_premium * remaining_annuity)
+                   / np.where(no_annuity, 1.0, remaining_annuity))
+
+        return np.where(no_annuity, remaining_assurance - annual_premium, np.maximum(0.0, reserve))
+
+    def _prospective_whole_life_compiled(self,
+                                         current_age: np.ndarray,
+                                         annual_premium: np.ndarray,
+                                         sum_assured: np.ndarray) -> np.ndarray:
+        """Run the batch whole life reserve through the parallel Numba kernel."""
+        current_age, annual_premium, sum_assured = np.broadcast_arrays(
+            current_age, annual_premium, sum_assured)
+        ages = self.mt.ages
+        if np.any((current_age < ages[0]) | (current_age > ages[-1])):
+            raise ValueError("All ages must be in the mortality table")
+
+        start = np.ascontiguousarray((current_age - ages[0]).ravel(), dtype=np.int64)
+        # Whole life runs to the last table age, so the extrapolated tail rows are not needed
+        rows = len(ages) + 1
+        reserves = _prospective_whole_life_batch(
+            start, self.sf.cum_log_px[:rows], self.sf._cum_certain_deaths[:rows], self.sf.v_pow,
+            np.ascontiguousarray(annual_premium.ravel()), np.ascontiguousarray(sum_assured.ravel()))
+        return reserves.reshape(current_age.shape)
+
     def prospective_reserve_term(self,
                                x: int,
                                n: int,
@@ -131,11 +221,12 @@ class Reserves:
         # Endowment reserve = [A_{x+t}:n¨ * SA + v^{n-t} * SA - P * ä_{x+t}:n¨] / ä_{x+t}:n¨
 
         # Calculate remaining endowment assurance
-        term_assurance = self.sf.assurance(current_age, remaining_term) * sum_assured
-        pure_endowment = self.sf.npx(current_age, remaining_term) * self.v ** remaining_term * sum_assured
-        remaining_assurance = term_assurance + pure_endowment
+        term_assurance, pure_endowment, annuity_due = self.sf.endowment_components(
+            current_age, remaining_term)
+        remaining_assurance = (term_assurance + pure_endowment) * sum_assured
 
-        remaining_annuity = self.sf.annuity_immediate(current_age, remaining_term)
+        # Immediate annuity: drop the payment at time 0, add the one at time n
+        remaining_annuity = annuity_due - 1.0 + pure_endowment
 
         if remaining_annuity == 0:
             return remaining_assurance - annual_premium
@@ -162,29 +253,25 @@ class Reserves:
             Retrospective reserve
         """
         # Retrospective reserve = Accumulated premiums + interest - claims paid
+        if duration <= 0:
+            return 0.0
 
-        accumulated_premiums = 0.0
-        interest_factor = 1.0
+        # tpx for t = 0..duration; premium t is paid with probability tpx[t] and
+        # the year-(t+1) death claim has probability tpx[t] - tpx[t+1]
+        tpx = self.sf.npx_array(x, np.arange(duration + 1))
 
-        for t in range(duration):
-            age_at_premium = x + t
-            survival_prob = self.sf.npx(x, t)  # Probability of surviving to pay premium
-            accumulated_premiums += annual_premium * survival_prob * interest_factor
-            interest_factor *= (1 + self.i)
+        if NUMBA_AVAILABLE:
+            return float(_retrospective_reserve(tpx, float(self.i), float(annual_premium),
+                                                float(sum_assured)))
 
+        interest_factor = (1 + self.i) ** np.arange(duration)
+        accumulated_premiums = annual_premium * np.dot(tpx[:-1], interest_factor)
         # Claims paid (simplified - only death claims, ignoring surrenders, etc.)
-        claims_paid = 0.0
-        interest_factor = 1.0
-
-        for t in range(1, duration + 1):
-            # Probability of dying in year t
-            q_t = 1 - self.sf.npx(x, t) + self.sf.npx(x, t-1)
-            claims_paid += q_t * sum_assured * interest_factor
-            interest_factor *= (1 + self.i)
+        claims_paid = sum_assured * np.dot(tpx[:-1] - tpx[1:], interest_factor)
 
         reserve = accumulated_premiums - claims_paid
 
-        return max(0, reserve)
+        return max(0.0, float(reserve))
 
     def net_level_premium_reserve(self,
                                 x: int,
@@ -206,8 +293,8 @@ class Reserves:
         # Reserve = v * [A_{x+t} * SA - P * ä_{x+t}]
         current_age = x + duration
 
-        remaining_assurance = self.sf.assurance(current_age) * sum_assured
-        remaining_annuity = self.sf.annuity_immediate(current_age)
+        assurance, remaining_annuity = self._whole_life_values(current_age)
+        remaining_assurance = assurance * sum_assured
 
         reserve = remaining_assurance - net_premium * remaining_annuity
 
@@ -287,20 +374,24 @@ class Reserves:
         Returns:
             Dictionary with distribution statistics
         """
-        reserves_array = np.array(reserves)
+        reserves_array = np.ascontiguousarray(reserves, dtype=np.float64)
+
+        # One partial sort for the median and all percentiles
+        quantiles = np.quantile(reserves_array, [0.25, 0.5, 0.75, 0.9, 0.95])
+        total = reserves_array.sum()
 
         distribution = {
-            'mean_reserve': np.mean(reserves_array),
-            'median_reserve': np.median(reserves_array),
-            'min_reserve': np.min(reserves_array),
-            'max_reserve': np.max(reserves_array),
-            'total_reserves': np.sum(reserves_array),
-            'reserve_to_portfolio_ratio': np.sum(reserves_array) / total_portfolio_value if total_portfolio_value > 0 else 0,
+            'mean_reserve': total / reserves_array.size,
+            'median_reserve': quantiles[1],
+            'min_reserve': reserves_array.min(),
+            'max_reserve': reserves_array.max(),
+            'total_reserves': total,
+            'reserve_to_portfolio_ratio': total / total_portfolio_value if total_portfolio_value > 0 else 0,
             'percentiles': {
-                '25th': np.percentile(reserves_array, 25),
-                '75th': np.percentile(reserves_array, 75),
-                '90th': np.percentile(reserves_array, 90),
-                '95th': np.percentile(reserves_array, 95)
+                '25th': quantiles[0],
+                '75th': quantiles[2],
+                '90th': quantiles[3],
+                '95th': quantiles[4]
             }
         }
 
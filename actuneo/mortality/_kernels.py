@@ -0,0 +1,31 @@
+"""
+Mortality Kernels
+
+Numba-compiled loops over the cumulative log-survival table built by
+SurvivalFunctions. Callers should only dispatch to them when NUMBA_AVAILABLE
+is True and keep their NumPy implementation as the fallback.
+"""
+
+import math
+
+import numpy as np
+
+from .._compat import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _npx_batch(cum_log_px, cum_certain_deaths, px_last, start, end):
+    """Survival from row start[k] to row end[k] for every k, one pair per thread.
+
+    Rows past the end of cum_log_px carry on at px_last, as in _survival_to_row.
+    """
+    cap = cum_log_px.shape[0] - 1
+    out = np.empty(start.shape[0])
+    for k in prange(start.shape[0]):
+        s = start[k]
+        e = min(end[k], cap)
+        if cum_certain_deaths[e] > cum_certain_deaths[s]:
+            out[k] = 0.0
+        else:
+            out[k] = math.exp(cum_log_px[e] - cum_log_px[s]) * px_last ** max(end[k] - cap, 0)
+    return out
@@ -6,10 +6,15 @@ including loading, manipulation, and basic calculations.
 """
 
 import numpy as np
-import pandas as pd
 import os
 from importlib import resources
-from typing import Union, Dict, List, Optional
+from typing import TYPE_CHECKING, Union, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Optional columns carried over from DataFrames and CSV files
+_TABLE_COLUMNS = ["mx", "lx", "dx", "Lx", "Tx", "ex"]
 
 
 class MortalityTable:
@@ -25,7 +30,8 @@ class MortalityTable:
                  qx: Union[List[float], np.ndarray],
                  name: str = "Unnamed Table",
                  metadata: Optional[Dict] = None,
-                 table_columns: Optional[Dict[str, Union[List[float], np.ndarray]]] = None):
+                 table_columns: Optional[Dict[str, Union[List[float], np.ndarray]]] = None,
+                 dtype: Union[type, np.dtype] = np.float64):
         """
         Initialize a mortality table.
 
@@ -35,9 +41,17 @@ class MortalityTable:
             name: Name/description of the mortality table
             metadata: Additional metadata about the table
             table_columns: Additional actuarial columns aligned to ages (e.g. mx, lx, dx, Lx, Tx, ex)
+            dtype: Storage type for the rate and survivorship arrays, float64 or float32.
+                float32 halves the memory of large tables; derived columns are still
+                computed in float64, and the table stays float64 if lx would underflow.
         """
-        ages_arr = np.array(ages, dtype=int)
-        qx_arr = np.array(qx, dtype=float)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+            raise ValueError("dtype must be float32 or float64")
+
+        ages_arr = np.array(ages, dtype=np.int64)
+        # Rates are rounded to the storage type before anything is derived from them
+        qx_arr = np.array(qx, dtype=self.dtype).astype(float)
 
         if ages_arr.ndim != 1 or qx_arr.ndim != 1:
             raise ValueError("ages and qx must be 1-dimensional")
@@ -45,13 +59,22 @@ class MortalityTable:
         if len(ages_arr) != len(qx_arr):
             raise ValueError("ages and qx must have the same length")
 
-        sort_idx = np.argsort(ages_arr)
-        ages_arr = ages_arr[sort_idx]
-        qx_arr = qx_arr[sort_idx]
+        # Two reductions and no boolean temporaries; NaN fails both comparisons
+        if qx_arr.size and not (qx_arr.min() >= 0 and qx_arr.max() <= 1):
+            raise ValueError("All qx values must be between 0 and 1")
 
-        unique_ages, counts = np.unique(ages_arr, return_counts=True)
-        if np.any(counts > 1):
-            duplicate_ages = unique_ages[counts > 1].tolist()
+        # Sort by age, skipping the reindex when the ages are already in order
+        if np.all(np.diff(ages_arr) >= 0):
+            sort_idx = None
+        else:
+            sort_idx = np.argsort(ages_arr, kind='stable')
+            ages_arr = ages_arr[sort_idx]
+            qx_arr = qx_arr[sort_idx]
+
+        # On sorted ages a duplicate is a zero step, so one diff checks uniqueness
+        repeated = np.diff(ages_arr) == 0
+        if np.any(repeated):
+            duplicate_ages = np.unique(ages_arr[1:][repeated]).tolist()
             raise ValueError(f"ages must be unique. Duplicate ages found: {duplicate_ages}")
 
         self.ages = ages_arr
@@ -67,19 +90,27 @@ class MortalityTable:
                 if len(arr) != len(self.ages):
                     raise ValueError(f"table column '{key}' must have the same length as ages")
                 self._table_columns[key] = arr
-            for key in list(self._table_columns.keys()):
-                self._table_columns[key] = self._table_columns[key][sort_idx]
-
-        # Validate inputs
-        if not np.all((self.qx_values >= 0) & (self.qx_values <= 1)):
-            raise ValueError("All qx values must be between 0 and 1")
+            if sort_idx is not None:
+                for key in list(self._table_columns.keys()):
+                    self._table_columns[key] = self._table_columns[key][sort_idx]
 
         # Calculate derived quantities
         self._calculate_survival_probabilities()
+        self._apply_dtype()
 
     def _calculate_survival_probabilities(self):
         """Calculate survival probabilities (px) and cumulative survival (lx, dx)."""
         self.px_values = 1.0 - self.qx_values
+        # O(1) age -> row lookup
+        self._age_to_idx = {int(age): idx for idx, age in enumerate(self.ages)}
+
+        # Cumulative log survival by row, so products of px are one subtraction and exp.
+        # log1p(-qx) keeps the precision of small qx; rows with qx == 1 are left at zero
+        # in the log sum and counted in _cum_certain_deaths instead.
+        certain_death = self.qx_values >= 1
+        self._log_px = np.log1p(-np.where(certain_death, 0.0, self.qx_values))
+        self._log_px_cum = np.concatenate(([0.0], np.cumsum(self._log_px)))
+        self._cum_certain_deaths = np.concatenate(([0], np.cumsum(certain_death)))
 
         radix = self.metadata.get("radix")
         if "lx" in self._table_columns and len(self._table_columns["lx"]) > 0 and not np.isnan(self._table_columns["lx"][0]):
@@ -90,14 +121,14 @@ class MortalityTable:
         if "lx" in self._table_columns:
             self.lx_values = self._table_columns["lx"].astype(float)
         else:
-            lx = np.zeros_like(self.qx_values, dtype=float)
-            lx[0] = float(radix)
-            for i in range(1, len(lx)):
-                gap = int(self.ages[i] - self.ages[i - 1])
-                if gap <= 0:
-                    raise ValueError("ages must be strictly increasing")
-                lx[i] = lx[i - 1] * (self.px_values[i - 1] ** gap)
-            self.lx_values = lx
+            gaps = np.diff(self.ages)
+            if np.any(gaps <= 0):
+                raise ValueError("ages must be strictly increasing")
+            # lx[i] = radix * prod(px[j] ** gap[j] for j < i), summed in log space so that long
+            # tables do not underflow; lx is zero from the row after any qx == 1
+            log_lx = np.concatenate(([0.0], np.cumsum(gaps * self._log_px[:-1])))
+            alive = self._cum_certain_deaths[:-1] == 0
+            self.lx_values = np.where(alive, float(radix) * np.exp(log_lx), 0.0)
 
         if "dx" in self._table_columns:
             self.dx_values = self._table_columns["dx"].astype(float)
@@ -114,7 +145,8 @@ class MortalityTable:
         else:
             self.Tx_values = np.cumsum(self.Lx_values[::-1])[::-1]
 
-        computed_ex = np.where(self.lx_values > 0, self.Tx_values / self.lx_values, 0.0)
+        computed_ex = np.divide(self.Tx_values, self.lx_values, out=np.zeros_like(self.Tx_values),
+                                where=self.lx_values > 0)
         if "ex" in self._table_columns:
             self.ex_values = self._table_columns["ex"].astype(float)
             # CSV exports often omit ex; fill from Tx/lx (same as Zimbabwe 2023 tables in Excel)
@@ -124,9 +156,23 @@ class MortalityTable:
 
         self.mx_values = self._table_columns.get("mx")
 
+    def _apply_dtype(self):
+        """Cast the stored columns to self.dtype, keeping float64 if lx would underflow."""
+        if self.dtype == np.float64:
+            return
+        positive_lx = self.lx_values[self.lx_values > 0]
+        if positive_lx.size and positive_lx.min() < np.finfo(self.dtype).tiny:
+            self.dtype = np.dtype(np.float64)
+            return
+        for attr in ("qx_values", "px_values", "lx_values", "dx_values",
+                     "Lx_values", "Tx_values", "ex_values", "mx_values"):
+            values = getattr(self, attr)
+            if values is not None:
+                setattr(self, attr, values.astype(self.dtype))
+
     @classmethod
     def from_dataframe(cls,
-                      df: pd.DataFrame,
+                      df: 'pd.DataFrame',
                       age_col: str = 'age',
                       qx_col: str = 'qx',
                       name: str = "DataFrame Table",
@@ -143,12 +189,13 @@ class MortalityTable:
         Returns:
             MortalityTable instance
         """
-        ages = df[age_col].values
-        qx = df[qx_col].values
+        # to_numpy materializes plain NumPy arrays even for nullable extension dtypes
+        ages = df[age_col].to_numpy(dtype=np.int64)
+        qx = df[qx_col].to_numpy(dtype=np.float64, na_value=np.nan)
         extra_cols = {}
-        for key in ["mx", "lx", "dx", "Lx", "Tx", "ex"]:
+        for key in _TABLE_COLUMNS:
             if key in df.columns:
-                extra_cols[key] = df[key].values
+                extra_cols[key] = df[key].to_numpy(dtype=np.float64, na_value=np.nan)
         return cls(ages, qx, name, metadata=metadata, table_columns=extra_cols or None)
 
     @classmethod
@@ -161,6 +208,9 @@ class MortalityTable:
         """
         Create a MortalityTable from a CSV file.
 
+        The file is parsed with NumPy, so pandas is not needed. It must have a
+        header row; empty numeric fields are read as NaN.
+
         Args:
             filepath: Path to CSV file
             age_col: Column name for ages
@@ -170,9 +220,18 @@ class MortalityTable:
         Returns:
             MortalityTable instance
         """
-        df = pd.read_csv(filepath)
+        data = np.atleast_1d(np.genfromtxt(filepath, delimiter=',', names=True, dtype=float,
+                                           deletechars='', replace_space=' ',
+                                           encoding='utf-8-sig'))
+        columns = data.dtype.names
+        for key in (age_col, qx_col):
+            if key not in columns:
+                raise ValueError(f"Column '{key}' not found in {filepath}")
+
+        extra_cols = {key: data[key] for key in _TABLE_COLUMNS if key in columns}
         table_name = name or os.path.splitext(os.path.basename(filepath))[0]
-        return cls.from_dataframe(df, age_col, qx_col, table_name, metadata=metadata)
+        return cls(data[age_col], data[qx_col], table_name, metadata=metadata,
+                   table_columns=extra_cols or None)
 
     @classmethod
     def from_zimbabwe_2023(cls, table: str) -> 'MortalityTable':
@@ -202,7 +261,9 @@ class MortalityTable:
                 metadata={"country": "Zimbabwe", "year": 2023},
             )
 
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> 'pd.DataFrame':
+        import pandas as pd
+
         df = pd.DataFrame(
             {
                 "age": self.ages,
@@ -229,19 +290,7 @@ class MortalityTable:
         Returns:
             Mortality rate(s)
         """
-        ages_array = np.atleast_1d(age).astype(int)
-        result = np.zeros_like(ages_array, dtype=float)
-
-        for i, a in enumerate(ages_array):
-            if a in self.ages:
-                result[i] = self.qx_values[np.where(self.ages == a)[0][0]]
-            else:
-                result[i] = np.nan
-
-        if np.isscalar(age) or (hasattr(age, '__len__') and len(age) == 1):
-            return float(result.item()) if result.ndim == 0 else float(result[0])
-        else:
-            return result
+        return self._lookup(self.qx_values, age)
 
     def px(self, age: Union[int, List[int]]) -> Union[float, np.ndarray]:
         """
@@ -253,43 +302,62 @@ class MortalityTable:
         Returns:
             Survival probability(ies)
         """
-        qx_vals = self.qx(age)
-        px_vals = 1 - qx_vals
+        return self._lookup(self.px_values, age)
+
+    def _lookup(self, values: np.ndarray, age: Union[int, List[int]]) -> Union[float, np.ndarray]:
+        """Gather a per-age column at the given age(s), with NaN for ages not in the table."""
+        if isinstance(age, (int, np.integer)):
+            # Scalar fast path: one dict lookup, no array allocation
+            idx = self._age_to_idx.get(int(age))
+            return float(values[idx]) if idx is not None else float('nan')
+
+        ages_array = np.atleast_1d(age).astype(int)
 
-        if np.isscalar(px_vals):
-            return px_vals if not np.isnan(px_vals) else np.nan
+        # self.ages is sorted in __init__, so one searchsorted gathers every row
+        idx = np.minimum(np.searchsorted(self.ages, ages_array), len(self.ages) - 1)
+        valid = self.ages[idx] == ages_array
+        result = np.where(valid, values[idx], np.nan)
+
+        if np.isscalar(age) or (hasattr(age, '__len__') and len(age) == 1):
+            return float(result.item()) if result.ndim == 0 else float(result[0])
         else:
-            px_vals = np.where(np.isnan(qx_vals), np.nan, px_vals)
-            return px_vals
+            return result
 
     def npx(self, x: int, n: int) -> float:
         if n < 0:
             return 0.0
         if n == 0:
             return 1.0
-        if x not in self.ages:
+        start_idx = self._age_to_idx.get(x)
+        if start_idx is None:
             return 0.0
 
-        start_idx = int(np.where(self.ages == x)[0][0])
         end_age = x + n
-        if end_age in self.ages:
-            end_idx = int(np.where(self.ages == end_age)[0][0])
+        end_idx = self._age_to_idx.get(end_age)
+        if end_idx is not None:
             if end_idx <= start_idx:
                 return 0.0
-            return float(np.prod(self.px_values[start_idx:end_idx]))
+            return self._survival_rows(start_idx, end_idx)
 
         if end_age > self.ages[-1]:
-            px = float(np.prod(self.px_values[start_idx:]))
+            # Survival to one year past the last age, then the last px for each further year
+            px = self._survival_rows(start_idx, len(self.ages))
             last_px = float(self.px_values[-1])
-            remaining_years = end_age - int(self.ages[-1])
+            remaining_years = end_age - int(self.ages[-1]) - 1
             return float(px * (last_px ** max(0, remaining_years)))
 
         return 0.0
 
+    def _survival_rows(self, start_idx: int, end_idx: int) -> float:
+        """Product of px over rows start_idx..end_idx-1, read from the cumulative log table."""
+        if self._cum_certain_deaths[end_idx] > self._cum_certain_deaths[start_idx]:
+            return 0.0
+        return float(np.exp(self._log_px_cum[end_idx] - self._log_px_cum[start_idx]))
+
     def ex(self, age: int) -> float:
-        if age not in self.ages:
+        idx = self._age_to_idx.get(age)
+        if idx is None:
             raise ValueError(f"Age {age} not found in mortality table")
-        idx = int(np.where(self.ages == age)[0][0])
         return float(self.ex_values[idx])
 
     def get_qx(self, age: Union[int, List[int]]) -> Union[float, np.ndarray]:
@@ -310,5 +378,17 @@ class MortalityTable:
         """
         return self.ex(age)
 
+    def life_expectancy_all(self) -> np.ndarray:
+        """
+        Get life expectancy at every table age.
+
+        The ex column is filled once at construction (Tx / lx, with Tx a reverse
+        cumulative sum of Lx), so this is a copy rather than a per-age loop.
+
+        Returns:
+            Array of life expectancies aligned to self.ages
+        """
+        return self.ex_values.astype(float)
+
     def __repr__(self) -> str:
         return f"MortalityTable(name='{self.name}', ages={len(self.ages)}, range=({self.ages[0]}-{self.ages[-1]}))"
@@ -5,10 +5,26 @@ Provides actuarial survival functions and calculations including
 temporary and permanent life functions, actuarial present values, etc.
 """
 
+import math
 import numpy as np
 from numbers import Real
-from typing import Optional
+from typing import Optional, Union, List, Dict, Tuple
 from .mortality_table import MortalityTable
+from ._kernels import NUMBA_AVAILABLE, _npx_batch
+
+# Survival is tabulated up to this age; past the last table age px is held at its
+# final value (constant force of mortality)
+_AGE_MAX = 130
+
+
+def _deferred_deaths(survival: np.ndarray) -> np.ndarray:
+    """
+    Probabilities of death in each year, (t-1)px - tpx, along the last axis.
+
+    Clamped to [0, 1] in one pass so rounding in the log-space products can never
+    give a negative probability.
+    """
+    return np.clip(survival[..., :-1] - survival[..., 1:], 0.0, 1.0)
 
 
 class SurvivalFunctions:
@@ -34,6 +50,43 @@ class SurvivalFunctions:
         self.i = float(interest_rate)
         self.v = 1 / (1 + self.i)  # Discount factor
 
+        self._first_age = int(self.mt.ages[0])
+        self._last_age = int(self.mt.ages[-1])
+        # Array lookups by age offset are only valid for single-year tables
+        self._contiguous = bool(np.all(np.diff(self.mt.ages) == 1))
+        # Commutation columns, built on first use
+        self._commutation = None
+        # Memoized npx, annuity_due and assurance keyed by (function, age, term);
+        # the table and interest rate are fixed for the lifetime of the instance
+        self._cache = {}
+
+        # Cumulative log survival: npx = exp(cum_log_px[idx(x+n)] - cum_log_px[idx(x)]),
+        # built from the table's log1p(-qx) column. Ages with px == 0 are counted
+        # separately rather than entering the sum as a huge negative log, which
+        # would cost precision in every later difference.
+        px = self.mt.px_values
+        self.log_px = self.mt._log_px.astype(px.dtype)
+        # Rows past the last age up to _AGE_MAX repeat the last px, so extrapolated
+        # survival is an ordinary lookup; row k of the tail is age last_age + k + 1
+        n_tail = max(_AGE_MAX - self._last_age, 0)
+        self._px_last = px[-1]
+        tail_log_px = np.full(n_tail, self.log_px[-1], dtype=px.dtype)
+        # Kept in the table's storage dtype, so float32 tables give float32 sweeps
+        self.cum_log_px = np.concatenate((np.zeros(1, dtype=px.dtype),
+                                          np.cumsum(np.concatenate((self.log_px, tail_log_px)))))
+        certain_deaths = np.concatenate((px <= 0, np.full(n_tail, px[-1] <= 0)))
+        self._cum_certain_deaths = np.concatenate(([0], np.cumsum(certain_deaths)))
+        # Discount factors v^t for t = 0..len(ages)+1
+        self.v_pow = self.v ** np.arange(len(self.mt.ages) + 2)
+
+    def _memo(self, key: tuple, compute) -> float:
+        """Return the cached value for key, computing and storing it on first use."""
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            self._cache[key] = value
+        return value
+
     def npx(self, x: int, n: int) -> float:
         """
         Calculate n-year survival probability: npx
@@ -45,34 +98,116 @@ class SurvivalFunctions:
         Returns:
             Probability that (x) survives n years
         """
+        return self._memo(('npx', x, n), lambda: self._npx(x, n))
+
+    def _npx(self, x: int, n: int) -> float:
+        """Uncached npx."""
         if n < 0:
             return 0.0
         if n == 0:
             return 1.0
 
-        if x + n > self.mt.ages[-1]:
-            # Extrapolate using last available survival probability
-            last_age_idx = np.where(self.mt.ages <= x)[0]
-            if len(last_age_idx) == 0:
-                return 0.0
-            last_idx = last_age_idx[-1]
-            remaining_years = x + n - self.mt.ages[last_idx]
-            px_remaining = self.mt.px_values[last_idx] ** remaining_years
-            return self.mt.lx_values[last_idx] * px_remaining / self.mt.lx_values[np.where(self.mt.ages == x)[0][0]]
+        # At most two dict lookups on the fast path
+        start_idx = self.mt._age_to_idx.get(x)
+        if start_idx is None:
+            if x >= self._first_age and x + n > self._last_age:
+                raise ValueError(f"Age {x} not found in mortality table")
+            return 0.0
 
-        # Find indices for ages x to x+n
-        start_idx = np.where(self.mt.ages == x)[0]
-        end_idx = np.where(self.mt.ages == x + n)[0]
+        if x + n > self._last_age:
+            # Past the table end: row index counts single years from the last age
+            end_idx = len(self.mt.ages) - 1 + (x + n - self._last_age)
+            return float(self._survival_to_row(start_idx, end_idx))
 
-        if len(start_idx) == 0 or len(end_idx) == 0:
+        end_idx = self.mt._age_to_idx.get(x + n)
+        if end_idx is None:
             return 0.0
 
-        start_idx = start_idx[0]
-        end_idx = end_idx[0]
-
         # Calculate cumulative survival probability
-        survival_prob = np.prod(self.mt.px_values[start_idx:end_idx])
-        return float(survival_prob)
+        return float(self._survival_between(start_idx, end_idx))
+
+    def _survival_to_row(self,
+                         start_idx: Union[int, np.ndarray],
+                         end_idx: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Like _survival_between, but end_idx may run past the tabulated rows.
+
+        Anything beyond _AGE_MAX carries on at the last px.
+        """
+        cap = len(self.cum_log_px) - 1
+        beyond = np.maximum(np.subtract(end_idx, cap), 0)
+        return self._survival_between(start_idx, np.minimum(end_idx, cap)) * self._px_last ** beyond
+
+    def _survival_between(self,
+                          start_idx: Union[int, np.ndarray],
+                          end_idx: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Return the product of px over table rows start_idx..end_idx-1 from cum_log_px.
+
+        A product that passes through a row with px == 0 is exactly zero.
+        """
+        survival = np.exp(self.cum_log_px[end_idx] - self.cum_log_px[start_idx])
+        crosses_death = self._cum_certain_deaths[end_idx] > self._cum_certain_deaths[start_idx]
+        return np.where(crosses_death, 0.0, survival)
+
+    def npx_array(self, x: int, durations: Union[List[int], np.ndarray]) -> np.ndarray:
+        """
+        Calculate survival probabilities npx for many durations at once.
+
+        Equivalent to [npx(x, n) for n in durations], computed from a single
+        cumulative product over the table for single-year tables.
+
+        Args:
+            x: Age
+            durations: Integer numbers of years
+
+        Returns:
+            Array of survival probabilities, one per duration
+        """
+        n = np.asarray(durations, dtype=int)
+        ages = self.mt.ages
+
+        if not self._contiguous or not ages[0] <= x <= ages[-1]:
+            return np.array([self.npx(x, int(d)) for d in n.ravel()], dtype=float).reshape(n.shape)
+
+        start_idx = int(x - ages[0])
+        result = self._survival_to_row(start_idx, start_idx + np.maximum(n, 0))
+        result = np.where(n < 0, 0.0, result)
+        return result.astype(float)
+
+    def npx_batch(self,
+                  x: Union[List[int], np.ndarray],
+                  n: Union[int, List[int], np.ndarray]) -> np.ndarray:
+        """
+        Calculate survival probabilities npx for arrays of ages and terms at once.
+
+        Equivalent to npx element by element; x and n are broadcast. On
+        single-year tables every pair is one lookup in cum_log_px, spread over
+        threads when Numba is available.
+
+        Args:
+            x: Ages
+            n: Integer numbers of years
+
+        Returns:
+            Array of survival probabilities
+        """
+        x, n = np.broadcast_arrays(np.asarray(x, dtype=int), np.asarray(n, dtype=int))
+        ages = self.mt.ages
+
+        if not self._contiguous or np.any((x < ages[0]) | (x > ages[-1])):
+            values = [self.npx(int(a), int(k)) for a, k in zip(x.ravel(), n.ravel())]
+            return np.array(values, dtype=float).reshape(x.shape)
+
+        start = (x - ages[0]).ravel()
+        end = start + np.maximum(n.ravel(), 0)
+        if NUMBA_AVAILABLE:
+            result = _npx_batch(self.cum_log_px, self._cum_certain_deaths,
+                                float(self._px_last), start, end)
+        else:
+            result = self._survival_to_row(start, end)
+        result = np.where(n.ravel() < 0, 0.0, result)
+        return result.astype(float).reshape(x.shape)
 
     def nqx(self, x: int, n: int) -> float:
         """
@@ -107,20 +242,23 @@ class SurvivalFunctions:
         n = int(t)
         frac = t - n
 
+        if n + x >= self._last_age:
+            # Constant force of mortality from the last age, as in npx
+            remaining_years = t - (self._last_age - x)
+            return self.npx(x, self._last_age - x) * float(self._px_last) ** remaining_years
+
+        start_idx = self.mt._age_to_idx.get(x) if self._contiguous else None
+        if start_idx is not None:
+            # One lookup in the cumulative log table and one qx read, with no npx call
+            end_idx = start_idx + n
+            if self._cum_certain_deaths[end_idx] > self._cum_certain_deaths[start_idx]:
+                return 0.0
+            log_survival = float(self.cum_log_px[end_idx] - self.cum_log_px[start_idx])
+            return math.exp(log_survival) * (1.0 - frac * float(self.mt.qx_values[end_idx]))
+
         # Base survival probability for n years
         n_year_survival = self.npx(x, n)
 
-        if n + x >= self.mt.ages[-1]:
-            # Extrapolate using constant force of mortality from last age
-            last_age = self.mt.ages[-1]
-            if x + n >= last_age:
-                remaining_years = t - (last_age - x)
-                q_last = self.mt.get_qx(last_age)
-                mu = -np.log(1 - q_last)  # Force of mortality approximation
-                return n_year_survival * np.exp(-mu * remaining_years)
-            else:
-                return n_year_survival
-
         # Linear interpolation for fractional year
         q_next = self.mt.get_qx(x + n)
         survival_frac = 1 - (frac * q_next)
@@ -138,22 +276,25 @@ class SurvivalFunctions:
         Returns:
             Actuarial present value of annuity-due
         """
+        return self._memo(('a_due', x, n), lambda: self._annuity_due(x, n))
+
+    def _annuity_due(self, x: int, n: Optional[int] = None) -> float:
+        """Uncached annuity_due."""
         if n is None:
             # Whole life annuity
-            annuity = 0.0
-            v_t = 1.0
-            for t in range(len(self.mt.ages) - np.where(self.mt.ages == x)[0][0]):
-                annuity += v_t * self.tpx(x, t)
-                v_t *= self.v
-            return annuity
-        else:
-            # Term annuity
-            annuity = 0.0
-            v_t = 1.0
-            for t in range(n):
-                annuity += v_t * self.tpx(x, t)
-                v_t *= self.v
-            return annuity
+            n = len(self.mt.ages) - self.mt._age_to_idx[x]
+
+        if n <= 0:
+            return 0.0
+
+        tpx = self.npx_array(x, np.arange(n))
+        return float(np.dot(self._discount_vector(n), tpx))
+
+    def _discount_vector(self, k: int) -> np.ndarray:
+        """Return v^t for t = 0..k-1, sliced from v_pow where it is long enough."""
+        if k <= len(self.v_pow):
+            return self.v_pow[:k]
+        return self.v ** np.arange(k)
 
     def annuity_immediate(self, x: int, n: Optional[int] = None) -> float:
         """
@@ -166,7 +307,17 @@ class SurvivalFunctions:
         Returns:
             Actuarial present value of immediate annuity
         """
-        return self.annuity_due(x, n) - 1.0
+        if n is None:
+            # Whole life: the annuity-due payments after the first
+            return self.annuity_due(x) - 1.0
+        return self._memo(('a_imm', x, n), lambda: self._annuity_immediate(x, n))
+
+    def _annuity_immediate(self, x: int, n: int) -> float:
+        """Uncached term annuity_immediate: sum of v^t tpx for t = 1..n."""
+        if n <= 0:
+            return 0.0
+        survival = self.npx_array(x, np.arange(1, n + 1))
+        return float(np.dot(self._discount_vector(n + 1)[1:], survival))
 
     def assurance(self, x: int, n: Optional[int] = None) -> float:
         """
@@ -179,27 +330,188 @@ class SurvivalFunctions:
         Returns:
             Actuarial present value of assurance
         """
+        return self._memo(('A', x, n), lambda: self._assurance(x, n))
+
+    def _assurance(self, x: int, n: Optional[int] = None) -> float:
+        """Uncached assurance."""
         if n is None:
             # Whole life assurance
-            assurance = 0.0
-            v_t = self.v
-            max_t = len(self.mt.ages) - np.where(self.mt.ages == x)[0][0] - 1
-            for t in range(1, max_t + 1):
-                # Simplified: probability of death in year t
-                q_xt = 1 - self.npx(x, t) / self.npx(x, t-1) if t > 1 else 1 - self.npx(x, 1)
-                assurance += v_t * min(q_xt, 1.0)  # Cap at 1.0
-                v_t *= self.v
-            return float(assurance)
-        else:
-            # Term assurance
-            assurance = 0.0
-            v_t = self.v
-            for t in range(1, n + 1):
-                # Simplified: probability of death in year t
-                q_xt = 1 - self.npx(x, t) / self.npx(x, t-1) if t > 1 else 1 - self.npx(x, 1)
-                assurance += v_t * min(q_xt, 1.0)  # Cap at 1.0
-                v_t *= self.v
-            return float(assurance)
+            n = len(self.mt.ages) - self.mt._age_to_idx[x] - 1
+
+        if n <= 0:
+            return 0.0
+
+        # Probability that (x) dies in year t: (t-1)px - tpx
+        survival = self.npx_array(x, np.arange(n + 1))
+        q_xt = _deferred_deaths(survival)
+        return float(np.dot(self._discount_vector(n + 1)[1:], q_xt))
+
+    def assurance_and_annuity(self, x: int) -> Tuple[float, float]:
+        """
+        Calculate whole life assurance and annuity-due together: (Ax, äx)
+
+        Matches (assurance(x), annuity_due(x)) but reads each survival probability
+        once instead of twice. Both use integer durations only, so npx serves
+        for the annuity as well.
+
+        Args:
+            x: Age
+
+        Returns:
+            Tuple of (whole life assurance, whole life annuity-due)
+        """
+        max_t = len(self.mt.ages) - self.mt._age_to_idx[x] - 1
+
+        survival = self.npx_array(x, np.arange(max_t + 1))
+        v_t = self._discount_vector(max_t + 1)
+
+        assurance = np.dot(v_t[1:], _deferred_deaths(survival))
+        annuity = np.dot(v_t, survival)
+
+        return float(assurance), float(annuity)
+
+    def endowment_components(self, x: int, n: int) -> Tuple[float, float, float]:
+        """
+        Calculate the pieces of an n-year endowment together: (A¹x:n, nEx, äx:n)
+
+        Matches (assurance(x, n), npx(x, n) * v^n, annuity_due(x, n)) from a
+        single survival vector.
+
+        Args:
+            x: Age
+            n: Term
+
+        Returns:
+            Tuple of (term assurance, pure endowment, temporary annuity-due)
+        """
+        if n <= 0:
+            return 0.0, float(self.npx(x, n)), 0.0
+
+        survival = self.npx_array(x, np.arange(n + 1))
+        v_t = self._discount_vector(n + 1)
+
+        term_assurance = np.dot(v_t[1:], _deferred_deaths(survival))
+        pure_endowment = v_t[n] * survival[n]
+        annuity = np.dot(v_t[:-1], survival[:-1])
+
+        return float(term_assurance), float(pure_endowment), float(annuity)
+
+    def _survival_matrix(self, x: np.ndarray, max_n: int) -> np.ndarray:
+        """
+        Return npx for every age in x and n = 0..max_n as a (len(x), max_n + 1) array.
+
+        Rows are gathered from cum_log_px; durations past the end of the table
+        are extrapolated as in npx. Requires a table with consecutive ages.
+        """
+        ages = self.mt.ages
+        if np.any((x < ages[0]) | (x > ages[-1])):
+            raise ValueError("All ages must be in the mortality table")
+
+        start = x - ages[0]
+        return self._survival_to_row(start[:, None], start[:, None] + np.arange(max_n + 1))
+
+    def assurance_batch(self,
+                        x: Union[List[int], np.ndarray],
+                        n: Optional[Union[int, List[int], np.ndarray]] = None) -> np.ndarray:
+        """
+        Calculate assurance values for arrays of ages and terms at once.
+
+        Equivalent to assurance element by element; x and n are broadcast.
+
+        Args:
+            x: Ages
+            n: Terms (None for whole life)
+
+        Returns:
+            Array of actuarial present values
+        """
+        x = np.asarray(x, dtype=int)
+        if not self._contiguous:
+            x, n = np.broadcast_arrays(x, np.asarray(n, dtype=object))
+            values = [self.assurance(int(a), None if k is None else int(k))
+                      for a, k in zip(x.ravel(), n.ravel())]
+            return np.array(values, dtype=float).reshape(x.shape)
+
+        if n is None:
+            n = len(self.mt.ages) - 1 - (x - self.mt.ages[0])
+        x, n = np.broadcast_arrays(x, np.asarray(n, dtype=int))
+        if x.size == 0:
+            return np.zeros(x.shape)
+
+        x_flat, n_flat = x.ravel(), n.ravel()
+        max_n = max(int(n_flat.max()), 0)
+        survival = self._survival_matrix(x_flat, max_n)
+
+        # Deferred death probabilities, masked to each policy's own term
+        q = _deferred_deaths(survival)
+        q *= np.arange(1, max_n + 1) <= n_flat[:, None]
+        return (q @ self._discount_vector(max_n + 1)[1:]).reshape(x.shape)
+
+    def annuity_due_batch(self,
+                          x: Union[List[int], np.ndarray],
+                          n: Optional[Union[int, List[int], np.ndarray]] = None) -> np.ndarray:
+        """
+        Calculate annuity-due values for arrays of ages and terms at once.
+
+        Equivalent to annuity_due element by element; x and n are broadcast.
+
+        Args:
+            x: Ages
+            n: Terms (None for whole life)
+
+        Returns:
+            Array of actuarial present values
+        """
+        x = np.asarray(x, dtype=int)
+        if not self._contiguous:
+            x, n = np.broadcast_arrays(x, np.asarray(n, dtype=object))
+            values = [self.annuity_due(int(a), None if k is None else int(k))
+                      for a, k in zip(x.ravel(), n.ravel())]
+            return np.array(values, dtype=float).reshape(x.shape)
+
+        if n is None:
+            n = len(self.mt.ages) - (x - self.mt.ages[0])
+        x, n = np.broadcast_arrays(x, np.asarray(n, dtype=int))
+        if x.size == 0:
+            return np.zeros(x.shape)
+
+        x_flat, n_flat = x.ravel(), n.ravel()
+        max_n = max(int(n_flat.max()), 0)
+        tpx = self._survival_matrix(x_flat, max_n)[:, :max_n]
+        tpx *= np.arange(max_n) < n_flat[:, None]
+        return (tpx @ self._discount_vector(max_n)).reshape(x.shape)
+
+    def commutation_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Calculate the commutation columns D, N, C and M aligned to the table ages.
+
+        D_x = v^x l_x, N_x = sum of D_y for y >= x, C_x = v^(x+1) d_x and
+        M_x = sum of C_y for y >= x. Survivorship is rebuilt from px so that
+        D_{x+n} / D_x reproduces npx exactly. The columns are computed once.
+
+        Returns:
+            Dictionary with keys 'D', 'N', 'C' and 'M'
+        """
+        if not self._contiguous:
+            raise ValueError("Commutation columns require a table with consecutive integer ages")
+
+        if self._commutation is None:
+            ages = self.mt.ages
+            lx = np.concatenate(([1.0], np.cumprod(self.mt.px_values[:-1])))
+            dx = lx * self.mt.qx_values
+
+            # v^x = v^(first age) * v^(row), with the row powers sliced from v_pow
+            v_first = self.v ** self._first_age
+            D = v_first * self.v_pow[:len(ages)] * lx
+            C = v_first * self.v_pow[1:len(ages) + 1] * dx
+            self._commutation = {
+                'D': D,
+                'N': np.cumsum(D[::-1])[::-1],
+                'C': C,
+                'M': np.cumsum(C[::-1])[::-1],
+            }
+
+        return self._commutation
 
     def net_single_premium(self, x: int, n: Optional[int] = None) -> float:
         """
@@ -58,7 +58,6 @@ setup(
     python_requires='>=3.8',
     install_requires=[
         'numpy>=1.21.0',
-        'pandas>=1.3.0',
         'scipy>=1.7.0',
         'matplotlib>=3.4.0',
     ],
@@ -79,6 +78,12 @@ setup(
             'plotly>=5.0.0',
             'seaborn>=0.11.0',
         ],
+        'numba': [
+            'numba>=0.55.0',
+        ],
+        'pandas': [
+            'pandas>=1.3.0',
+        ],
     },
     project_urls={
         'Bug Reports': 'https://github.com/ShannonT20/ACTUNEO/issues',
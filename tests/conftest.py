@@ -8,19 +8,19 @@ from actuneo.mortality import MortalityTable
 from actuneo.finance import YieldCurve
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mortality_table():
-    """Create a sample mortality table for testing."""
-    ages = np.arange(20, 101)
+    """Create a sample mortality table for testing, shared read-only across the session."""
+    ages = np.arange(20, 101, dtype=np.int64)
     # Simplified mortality rates - increasing with age
     qx = 0.001 + 0.00005 * (ages - 20)
     qx = np.clip(qx, 0, 0.1)  # Cap at 10% for reasonableness
-    return MortalityTable(ages, qx, name="Test Table")
+    return MortalityTable(ages, qx, name="Test Table", dtype=np.float64)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_yield_curve():
-    """Create a sample yield curve for testing."""
+    """Create a sample yield curve for testing, shared read-only across the session."""
     maturities = [1, 2, 3, 5, 10, 20, 30]
     yields = [0.03, 0.035, 0.04, 0.045, 0.055, 0.065, 0.07]
     return YieldCurve(maturities, yields, interpolation_method='linear')
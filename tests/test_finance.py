@@ -2,6 +2,10 @@
 Tests for the finance module.
 """
 
+import subprocess
+import sys
+import warnings
+
 import numpy as np
 import pytest
 from actuneo.finance import InterestTheory, YieldCurve, DurationConvexity
@@ -56,6 +60,14 @@ class TestInterestTheory:
         fv_ann = it.annuity_future_value(100, 10)
         assert fv_ann > 0
 
+        # Agree with the textbook formulas, and handle a zero rate without warnings
+        assert abs(ann_imm - 100 * (1 - 1.05 ** -10) / 0.05) < 1e-9
+        assert abs(fv_ann - 100 * (1.05 ** 10 - 1) / 0.05) < 1e-9
+        with np.errstate(all='raise'):
+            factors = it.annuity_present_value(1, 10, interest_rate=np.array([0.0, 1e-9, 0.05]))
+        assert factors[0] == 10
+        assert abs(factors[1] - 10) < 1e-6
+
     def test_loan_calculations(self):
         """Test loan payment and balance calculations."""
         it = InterestTheory(0.06)
@@ -68,6 +80,53 @@ class TestInterestTheory:
         balance = it.loan_balance(100000, 30, 5)  # After 5 payments
         assert balance < 100000  # Should be less than original
 
+    def test_vectorized_annuities_and_loans(self):
+        """Test that annuity and loan functions broadcast over arrays."""
+        it = InterestTheory(0.05)
+
+        rates = np.array([0.0, 0.03, 0.06])
+        periods = np.array([10, 20, 30])
+
+        pv = it.annuity_present_value(100, periods, interest_rate=rates)
+        expected = [it.annuity_present_value(100, n, interest_rate=r) for r, n in zip(rates, periods)]
+        assert isinstance(pv, np.ndarray)
+        assert np.allclose(pv, expected, rtol=1e-12)
+        assert pv[0] == 100 * 10
+
+        payments = it.loan_payment(100000, periods, interest_rate=rates)
+        assert np.allclose(payments, [it.loan_payment(100000, n, r) for r, n in zip(rates, periods)])
+
+        # Closed-form balance equals PV of the remaining payments
+        balance = it.loan_balance(100000, 30, 5)
+        remaining = it.annuity_present_value(it.loan_payment(100000, 30), 25)
+        assert abs(balance - remaining) < 1e-6
+        assert it.loan_balance(1200, 12, 3, interest_rate=0.0) == 900
+
+        # Payment is principal over the annuity factor, including at zero interest
+        assert abs(it.loan_payment(100000, 30) * it.annuity_present_value(1, 30) - 100000) < 1e-8
+        assert it.loan_payment(1200, 12, interest_rate=0.0) == 100
+
+        # Scalar inputs take a math-module path that agrees with the array path
+        scalar = it.loan_balance(100000, 30, 5)
+        assert isinstance(scalar, float)
+        for rate in (0.05, 0.0):
+            with pytest.raises(ValueError):
+                it.loan_payment(1000, 0, interest_rate=rate)
+            with pytest.raises(ValueError):
+                it.loan_balance(1000, -1, 0, interest_rate=rate)
+
+        # Array terms are checked too, and a zero rate in the batch raises no warning
+        with pytest.raises(ValueError):
+            it.loan_payment(np.array([1000.0, 1000.0]), [12, 0])
+        with pytest.raises(ValueError):
+            it.loan_balance(1000.0, np.array([12, 0]), 3)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            mixed = it.loan_payment(np.array([1200.0, 1200.0]), 12, interest_rate=[0.0, 0.05])
+            it.loan_balance(np.array([1200.0, 1200.0]), 12, 3, interest_rate=[0.0, 0.05])
+        assert mixed[0] == 100
+        assert abs(scalar - it.loan_balance(np.array([100000.0]), [30], [5])[0]) < 1e-8
+
     def test_effective_rates(self):
         """Test effective rate conversions."""
         it = InterestTheory(0.05)
@@ -81,6 +140,14 @@ class TestInterestTheory:
         expected_real = (1.08 / 1.03) - 1  # Proper Fisher equation
         assert abs(real_rate - expected_real) < 1e-10
 
+        # Small rates keep full relative precision
+        tiny = it.real_interest_rate(2e-12, 1e-12)
+        assert abs(tiny - 1e-12) < 1e-20
+
+        # Inflation adjustment over an array of scenarios
+        real_values = it.inflation_adjusted_value(1000, np.array([0.0, 0.02, 0.1]), 5)
+        np.testing.assert_allclose(real_values, 1000 / np.array([1.0, 1.02, 1.1]) ** 5, rtol=1e-12)
+
 
 class TestYieldCurve:
     """Test cases for YieldCurve class."""
@@ -91,18 +158,53 @@ class TestYieldCurve:
         assert len(yc.maturities) == len(yc.yields)
         assert yc.interpolation_method == 'linear'
 
+        # Unsorted input is sorted; invalid input is rejected
+        unsorted = YieldCurve([5, 1, 2], [0.045, 0.03, 0.035])
+        np.testing.assert_array_equal(unsorted.maturities, [1, 2, 5])
+        np.testing.assert_array_equal(unsorted.yields, [0.03, 0.035, 0.045])
+        with pytest.raises(ValueError):
+            YieldCurve([1, 2, 3], [0.03, 0.035])
+        with pytest.raises(ValueError):
+            YieldCurve([0, 1, 2], [0.03, 0.035, 0.04])
+
     def test_yield_interpolation(self, sample_yield_curve):
         """Test yield interpolation."""
         yc = sample_yield_curve
 
         # Test interpolation within range
         y_4y = yc.get_yield(4)
+        assert isinstance(y_4y, float)
         assert 0.04 < y_4y < 0.045  # Between 3y and 5y yields
 
         # Test extrapolation
         y_40y = yc.get_yield(40)
         assert y_40y > yc.yields[-1]  # Should extrapolate upward
 
+    def test_vectorized_yields(self, sample_yield_curve):
+        """Test that get_yields matches scalar get_yield, including extrapolation."""
+        yc = sample_yield_curve
+
+        maturities = np.array([0.5, 1, 2.5, 4, 7, 15, 30, 40])
+        yields = yc.get_yields(maturities)
+        assert np.allclose(yields, [yc.get_yield(t) for t in maturities], rtol=0, atol=1e-15)
+
+        assert yields[0] == yc.yields[0]  # Flat below shortest maturity
+        assert [yc.get_yield(t) for t in yc.maturities] == yc.yields.tolist()
+
+        # Node arrays are read-only, so an in-place edit cannot desynchronise the paths
+        curve = YieldCurve(yc.maturities, yc.yields)
+        with pytest.raises(ValueError):
+            curve.yields[2] = 0.10
+        with pytest.raises(ValueError):
+            curve.maturities[0] = 0.5
+        assert curve.get_yield(2.5) == curve.get_yields([2.5])[0]
+        source = np.array(yc.yields)
+        curve.yields = source
+        source[2] = 0.10  # The curve keeps its own copy
+        assert curve.get_yield(2.5) == curve.get_yields([2.5])[0] == yc.get_yield(2.5)
+        slope = (0.07 - 0.065) / 10
+        assert abs(yields[-1] - (0.07 + slope * 10)) < 1e-12
+
     def test_spot_and_forward_rates(self, sample_yield_curve):
         """Test spot and forward rate calculations."""
         yc = sample_yield_curve
@@ -118,6 +220,17 @@ class TestYieldCurve:
         fwd_5to10 = yc.get_forward_rate(5, 10)
         assert fwd_5to10 > 0
 
+    def test_forward_rate_curve(self, sample_yield_curve):
+        """Test vectorized forward rates between curve nodes."""
+        yc = sample_yield_curve
+        midpoints, forward_rates = yc.forward_rate_curve()
+
+        m = yc.maturities
+        assert len(midpoints) == len(forward_rates) == len(m) - 1
+        np.testing.assert_allclose(midpoints, (m[1:] + m[:-1]) / 2)
+        expected = [yc.get_forward_rate(m[i - 1], m[i]) for i in range(1, len(m))]
+        np.testing.assert_allclose(forward_rates, expected, rtol=1e-12)
+
     def test_discount_factors(self, sample_yield_curve):
         """Test discount factor calculations."""
         yc = sample_yield_curve
@@ -128,6 +241,118 @@ class TestYieldCurve:
         df_10y = yc.get_discount_factor(10)
         assert df_10y < df_5y  # Longer maturity should have lower discount factor
 
+        # Vectorized discount factors agree with the cached scalar path
+        dfs = yc.get_discount_factors([5, 10])
+        np.testing.assert_allclose(dfs, [df_5y, df_10y], rtol=1e-12)
+        assert yc.get_discount_factor(5) == df_5y
+
+        # Replacing the curve data invalidates the cache
+        bumped = YieldCurve(yc.maturities, yc.yields)
+        bumped.get_discount_factor(5)
+        bumped.yields = bumped.yields + 0.01
+        assert bumped.get_discount_factor(5) < df_5y
+
+        # In-place edits are rejected rather than served from the stale cache
+        with pytest.raises(ValueError):
+            bumped.yields[2] = 0.10
+        edited = bumped.yields.copy()
+        edited[2] = 0.10
+        bumped.get_discount_factor(3)
+        bumped.yields = edited
+        expected_df = YieldCurve(yc.maturities, edited).get_discount_factor(3)
+        assert abs(bumped.get_discount_factor(3) - expected_df) < 1e-15
+
+        # A non-parallel change refreshes the extrapolation slope as well
+        reshaped = YieldCurve(yc.maturities, yc.yields)
+        new_yields = yc.yields.copy()
+        new_yields[-1] = 0.06
+        reshaped.yields = new_yields
+        fresh = YieldCurve(yc.maturities, new_yields)
+        assert abs(reshaped.get_yield(40) - fresh.get_yield(40)) < 1e-15
+        np.testing.assert_allclose(reshaped.get_yields([40, 50]), fresh.get_yields([40, 50]))
+        cubic = YieldCurve(yc.maturities, yc.yields, interpolation_method='cubic')
+        cubic.yields = new_yields
+        assert cubic.get_yield(25) == YieldCurve(yc.maturities, new_yields, 'cubic').get_yield(25)
+
+    def test_nelson_siegel_fit(self, sample_yield_curve):
+        """Test Nelson-Siegel fitting and its analytic gradient."""
+        from actuneo.finance._kernels import _ns_objective, _ns_objective_grad
+
+        yc = YieldCurve(sample_yield_curve.maturities, sample_yield_curve.yields,
+                        interpolation_method='nelson_siegel')
+        fitted = np.array([yc.get_yield(t) for t in yc.maturities])
+        assert np.max(np.abs(fitted - yc.yields)) < 0.0025
+
+        # The short end is the t -> 0 limit beta0 + beta1, on both the scalar and array paths
+        beta0, beta1 = yc.ns_params[:2]
+        assert abs(yc.get_yield(0) - (beta0 + beta1)) < 1e-15
+        assert yc.get_yields([0.0, 1.0])[0] == yc.get_yield(0)
+        assert yc.get_discount_factor(0) == 1.0
+
+        params = np.array([0.07, -0.04, -0.04, 2.0])
+        grad = _ns_objective_grad(params, yc.maturities, yc.yields)
+        step = 1e-7
+        numerical = [(_ns_objective(params + step * e, yc.maturities, yc.yields)
+                      - _ns_objective(params - step * e, yc.maturities, yc.yields)) / (2 * step)
+                     for e in np.eye(4)]
+        assert np.allclose(grad, numerical, rtol=1e-5, atol=1e-10)
+
+        # A zero maturity uses the same t -> 0 limit in the objective and the gradient
+        t0 = np.array([0.0, 1.0, 5.0])
+        y0 = np.array([0.03, 0.035, 0.04])
+        grad0 = _ns_objective_grad(params, t0, y0)
+        numerical0 = [(_ns_objective(params + step * e, t0, y0)
+                       - _ns_objective(params - step * e, t0, y0)) / (2 * step)
+                      for e in np.eye(4)]
+        assert np.all(np.isfinite(grad0))
+        assert np.allclose(grad0, numerical0, rtol=1e-5, atol=1e-10)
+
+    def test_price_bond_batch(self, sample_yield_curve):
+        """Test batch pricing of zero-padded cash flow streams."""
+        yc = sample_yield_curve
+        cash_flows = np.array([[5, 5, 105, 0], [3, 3, 3, 103]])
+        times = np.array([[1, 2, 3, 0], [1, 2, 3, 4]])
+
+        prices = yc.price_bond_batch(cash_flows, times)
+        assert prices.shape == (2,)
+        for row in range(2):
+            expected = sum(cf * yc.get_discount_factor(t)
+                           for cf, t in zip(cash_flows[row], times[row]) if cf)
+            assert abs(prices[row] - expected) < 1e-10
+
+        # Padded rows price the same on every interpolation method
+        for method in ('linear', 'cubic', 'nelson_siegel'):
+            curve = YieldCurve(yc.maturities, yc.yields, interpolation_method=method)
+            padded = curve.price_bond_batch([[5, 5, 105, 0]], [[1, 2, 3, 0]])
+            unpadded = curve.price_bond_batch([[5, 5, 105]], [[1, 2, 3]])
+            assert np.isfinite(padded[0]) and abs(padded[0] - unpadded[0]) < 1e-12
+
+    def test_with_bumped_yield(self, sample_yield_curve):
+        """Test bumping a single node without rebuilding the curve."""
+        yc = sample_yield_curve
+        t = np.array([0.5, 2.5, 5, 12, 40])
+
+        bumped = yc.with_bumped_yield(3, 0.001)
+        rebuilt_yields = yc.yields.copy()
+        rebuilt_yields[3] += 0.001
+        rebuilt = YieldCurve(yc.maturities, rebuilt_yields)
+        np.testing.assert_allclose(bumped.get_yields(t), rebuilt.get_yields(t), rtol=1e-14)
+        assert yc.yields[3] == 0.045  # Original curve untouched
+
+        # Nelson-Siegel curves are bumped by a tent on the fitted output
+        ns = YieldCurve(yc.maturities, yc.yields, interpolation_method='nelson_siegel')
+        ns_bumped = ns.with_bumped_yield(3, 0.001)
+        assert abs(ns_bumped.get_yield(5) - ns.get_yield(5) - 0.001) < 1e-14
+        assert abs(ns_bumped.get_yield(1) - ns.get_yield(1)) < 1e-14
+        np.testing.assert_allclose(ns_bumped.ns_params, ns.ns_params)
+
+    def test_import_does_not_load_plotting(self):
+        """Test that importing the finance module leaves matplotlib unloaded."""
+        code = "import sys, actuneo.finance; print('matplotlib' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
+
     def test_bootstrap_spot_rates(self, sample_yield_curve):
         """Test spot rate bootstrapping."""
         yc = sample_yield_curve
@@ -135,6 +360,7 @@ class TestYieldCurve:
 
         assert len(spot_rates) == len(yc.maturities)
         assert all(rate > 0 for rate in spot_rates.values())
+        assert list(spot_rates.items()) == list(zip(yc.maturities, yc.yields))
 
 
 class TestDurationConvexity:
@@ -151,6 +377,47 @@ class TestDurationConvexity:
         duration = dc.macaulay_duration(cash_flows, times, 0.05)
         assert duration > 0 and duration <= 5
 
+    def test_duration_convexity_match_summation(self):
+        """Test vectorized duration and convexity against the defining sums."""
+        dc = DurationConvexity()
+
+        cash_flows = [50, 50, 50, 50, 1050]
+        times = [1, 2, 3, 4, 5]
+        y = 0.05
+
+        pvs = [cf * (1 + y) ** (-t) for cf, t in zip(cash_flows, times)]
+        expected_duration = sum(pv * t for pv, t in zip(pvs, times)) / sum(pvs)
+        expected_convexity = sum(pv * t * (t + 1) for pv, t in zip(pvs, times)) / (sum(pvs) * (1 + y) ** 2)
+
+        assert abs(dc.macaulay_duration(cash_flows, times, y) - expected_duration) < 1e-10
+        assert abs(dc.convexity(cash_flows, times, y) - expected_convexity) < 1e-10
+
+        # Reusing the instance across cash flow lengths gives the same answer
+        dc.convexity([5] * 40 + [105], list(range(1, 42)), y)
+        assert abs(dc.convexity(cash_flows, times, y) - expected_convexity) < 1e-10
+
+        with pytest.raises(ValueError):
+            dc.macaulay_duration(cash_flows, times[:-1], y)
+
+    def test_numpy_path_matches_kernels(self, monkeypatch):
+        """Test the NumPy duration and convexity path that runs without Numba."""
+        import actuneo.finance.duration_convexity as dc_module
+
+        cash_flows = [50, 50, 50, 50, 1050]
+        times = [0.5, 1, 2.5, 4, 5]
+        compiled = DurationConvexity()
+        expected = [(compiled.macaulay_duration(cash_flows, times, y),
+                     compiled.convexity(cash_flows, times, y)) for y in (0.05, 0.08)]
+
+        monkeypatch.setattr(dc_module, 'NUMBA_AVAILABLE', False)
+        fallback = DurationConvexity()
+        for (duration, convexity), y in zip(expected, (0.05, 0.08)):
+            assert abs(fallback.macaulay_duration(cash_flows, times, y) - duration) < 1e-12
+            assert abs(fallback.convexity(cash_flows, times, y) - convexity) < 1e-12
+        assert fallback.macaulay_duration([0.0, 0.0], [1, 2], 0.05) == 0.0
+        with pytest.raises(ValueError):
+            fallback.convexity([1.0, 2.0], [1.0], 0.05)
+
     def test_modified_duration(self):
         """Test modified duration."""
         dc = DurationConvexity()
@@ -184,6 +451,104 @@ class TestDurationConvexity:
         assert duration > 0 and duration <= 5
         assert convexity > 0
 
+    def test_bond_measures_match_cash_flow_measures(self):
+        """Test bond helpers against explicitly generated cash flows."""
+        dc = DurationConvexity()
+
+        cash_flows = [25.0] * 10
+        cash_flows[-1] += 1000
+        times = [(i + 1) / 2 for i in range(10)]
+
+        duration = dc.bond_duration(1000, 0.05, 5, 0.06)
+        convexity = dc.bond_convexity(1000, 0.05, 5, 0.06)
+
+        fresh = DurationConvexity()
+        assert abs(duration - fresh.macaulay_duration(cash_flows, times, 0.06)) < 1e-10
+        assert abs(convexity - fresh.convexity(cash_flows, times, 0.06)) < 1e-10
+
+        # The summation path generates the same coupon schedule itself
+        general = dc._bond_duration_general(1000, 0.05, 5, 0.06)
+        assert abs(general - fresh.macaulay_duration(cash_flows, times, 0.06)) < 1e-10
+
+    def test_bond_closed_form_matches_summation(self):
+        """Test closed-form bond measures against explicit summation."""
+        dc = DurationConvexity()
+
+        for coupon, maturity, y, freq in [(0.05, 5, 0.05, 2), (0.08, 30, 0.06, 2),
+                                          (0.0, 10, 0.04, 1), (0.03, 7, 0.12, 12),
+                                          (0.04, 3, 0.0001, 2)]:
+            duration = dc.bond_duration(1000, coupon, maturity, y, freq)
+            convexity = dc.bond_convexity(1000, coupon, maturity, y, freq)
+            expected_duration = dc._bond_duration_general(1000, coupon, maturity, y, freq)
+            expected_convexity = dc._bond_convexity_general(1000, coupon, maturity, y, freq)
+
+            assert abs(duration - expected_duration) < 1e-9 * expected_duration
+            assert abs(convexity - expected_convexity) < 1e-9 * expected_convexity
+
+        # Zero-coupon bond duration equals its maturity
+        assert abs(dc.bond_duration(1000, 0.0, 10, 0.04, 1) - 10) < 1e-10
+
+    def test_bond_summation_numpy_path(self, monkeypatch):
+        """Test the cash-flow bond summation used without Numba against the bond kernels."""
+        import actuneo.finance.duration_convexity as dc_module
+
+        cases = [(0.05, 5, 0.06, 2), (0.04, 3, 0.0001, 2), (0.03, 7, 0.12, 12)]
+        compiled = DurationConvexity()
+        expected = [(compiled._bond_duration_general(1000, *case),
+                     compiled._bond_convexity_general(1000, *case)) for case in cases]
+
+        monkeypatch.setattr(dc_module, 'NUMBA_AVAILABLE', False)
+        fallback = DurationConvexity()
+        for (duration, convexity), case in zip(expected, cases):
+            assert abs(fallback._bond_duration_general(1000, *case) - duration) < 1e-10
+            assert abs(fallback._bond_convexity_general(1000, *case) - convexity) < 1e-10
+
+    def test_key_rate_duration(self, sample_yield_curve):
+        """Test batched key rate durations against individually shifted curves."""
+        dc = DurationConvexity()
+        yc = sample_yield_curve
+
+        cash_flows = [5, 5, 5, 5, 5, 5, 5, 105]
+        times = [0.5, 1, 2, 3, 5, 8, 15, 35]
+        key_rates = [1, 2, 5, 10, 30]
+
+        krd = dc.key_rate_duration(cash_flows, times, key_rates, yc)
+
+        base_price = dc._calculate_pv_with_yield_curve(cash_flows, times, yc)
+        for key_rate in key_rates:
+            shifted = dc._shift_yield_curve(yc, key_rate, 0.0001)
+            shifted_price = dc._calculate_pv_with_yield_curve(cash_flows, times, shifted)
+            expected = -(shifted_price - base_price) / (base_price * 0.0001)
+            assert abs(krd[key_rate] - expected) < 1e-8
+
+        # The public node weights give the yield change of bumping any one node
+        weights = yc.linear_node_weights(times)
+        assert weights.shape == (len(yc.maturities), len(times))
+        np.testing.assert_allclose(weights.sum(axis=0), 1.0)
+        np.testing.assert_allclose(yc.with_bumped_yield(3, 0.001).get_yields(times),
+                                   yc.get_yields(times) + 0.001 * weights[3], rtol=1e-14)
+
+    def test_portfolio_duration(self):
+        """Test portfolio duration against position-by-position modified durations."""
+        dc = DurationConvexity()
+
+        positions = [
+            {'cash_flows': [5, 5, 105], 'times': [1, 2, 3], 'yield_rate': 0.04},
+            {'cash_flows': [100], 'times': [0.5], 'market_value': 250.0},
+            {'cash_flows': [3, 3, 3, 3, 103], 'times': [1, 2, 3, 4, 5], 'weight': 50.0},
+        ]
+
+        values, durations = [], []
+        for position in positions:
+            y = position.get('yield_rate', 0.05)
+            pv = sum(cf * (1 + y) ** (-t) for cf, t in zip(position['cash_flows'], position['times']))
+            values.append(position.get('weight', position.get('market_value', pv)))
+            durations.append(dc.modified_duration(position['cash_flows'], position['times'], y))
+        expected = np.dot(values, durations) / np.sum(values)
+
+        assert abs(dc.portfolio_duration(positions) - expected) < 1e-10
+        assert dc.portfolio_duration([]) == 0.0
+
     def test_price_change_approximation(self):
         """Test duration-convexity price change approximation."""
         dc = DurationConvexity()
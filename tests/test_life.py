@@ -30,6 +30,11 @@ class TestLifeAssurance:
         premium_40 = life_assurance.whole_life_assurance(40)
         assert premium_40 > premium
 
+        # Replacing the rate drops the memoized values
+        life_assurance.i = 0.03
+        assert life_assurance.whole_life_assurance(30) > premium
+        assert life_assurance.v == 1 / 1.03 and life_assurance.sf.i == 0.03
+
     def test_term_assurance(self, life_assurance):
         """Test term assurance premiums."""
         premium_10y = life_assurance.term_assurance(30, 10)
@@ -54,6 +59,82 @@ class TestLifeAssurance:
         expected = survival_prob * life_assurance.v ** 20
         assert abs(pe - expected) < 1e-10
 
+    def test_commutation_values(self, life_assurance):
+        """Test commutation-based values against the survival function sums."""
+        la = life_assurance
+        sf = la.sf
+        for x, n in [(30, 10), (45, 55), (99, 1)]:
+            assert abs(la.term_assurance(x, n) - sf.assurance(x, n)) < 1e-12
+            assert abs(la.temporary_life_annuity(x, n) - sf.annuity_immediate(x, n)) < 1e-12
+            assert abs(la.pure_endowment(x, n) - sf.npx(x, n) * la.v ** n) < 1e-12
+        assert abs(la.whole_life_assurance(40) - sf.assurance(40)) < 1e-12
+        assert abs(la.whole_life_annuity(40) - sf.annuity_immediate(40)) < 1e-12
+
+        # Tables with age gaps fall back to the survival functions
+        gapped = MortalityTable([20, 21, 23, 24], [0.01, 0.02, 0.03, 0.04])
+        la_gapped = LifeAssurance(gapped, interest_rate=0.05)
+        assert la_gapped._D is None
+        assert la_gapped.term_assurance(20, 1) == la_gapped.sf.assurance(20, 1)
+
+    def test_whole_life_premium(self, life_assurance):
+        """Test the fused whole life premium against its two components."""
+        la = life_assurance
+        for x in [30, 60, 100]:
+            expected = la.annual_premium(la.whole_life_assurance(x), la.whole_life_annuity(x))
+            assert abs(la.whole_life_premium(x) - expected) < 1e-12
+
+        assurance, annuity_due = la.sf.assurance_and_annuity(45)
+        assert abs(assurance - la.sf.assurance(45)) < 1e-12
+        assert abs(annuity_due - la.sf.annuity_due(45)) < 1e-12
+
+    def test_discount_table(self, life_assurance):
+        """Test precomputed discount factors against direct powers."""
+        la = life_assurance
+        assert len(la.v_pow) == 121
+        assert abs(la._v_power(20) - la.v ** 20) < 1e-15
+        assert abs(la._v_power(150) - la.v ** 150) < 1e-15  # Beyond the table
+        assert abs(la._v_power(2.5) - la.v ** 2.5) < 1e-15  # Fractional term
+        for t in [np.arange(1, 30), np.arange(100, 140)]:
+            np.testing.assert_allclose(la._v_powers(t), la.v ** t, rtol=1e-14)
+
+    def test_memoized_values(self, life_assurance):
+        """Test that repeated valuations are served from the instance cache."""
+        la = life_assurance
+        # Terms running past the table end are valued by the survival functions
+        first = la.term_assurance(90, 15)
+        assert ('A', 90, 15) in la._cache
+        assert la.term_assurance(90, 15) == first == la.sf.assurance(90, 15)
+
+    def test_contingent_assurance(self, life_assurance):
+        """Test contingent assurance uses the probability of death in each year."""
+        la = life_assurance
+        expected = sum(la.v ** t * (la.sf.npx(40, t - 1) - la.sf.npx(40, t)) * la.sf.npx(45, t)
+                       for t in range(1, 21))
+        assert abs(la.contingent_assurance(40, 45, 20) - expected) < 1e-12
+        assert la.contingent_assurance(40, 45, 20) < la.sf.nqx(40, 20)
+
+    def test_contingent_assurance_numpy_path(self, life_assurance, monkeypatch):
+        """Test the NumPy contingent assurance used without Numba against the kernel."""
+        import actuneo.life.life_assurance as la_module
+
+        la = life_assurance
+        cases = [(40, 45, 20), (30, 60, 50), (90, 95, 30)]
+        expected = [la.contingent_assurance(*case) for case in cases]
+        monkeypatch.setattr(la_module, 'NUMBA_AVAILABLE', False)
+        for value, case in zip(expected, cases):
+            assert abs(la.contingent_assurance(*case) - value) < 1e-14
+
+    def test_joint_life_assurance(self, life_assurance):
+        """Test the last survivor assurance against the year-by-year sum."""
+        la = life_assurance
+        expected = 0.0
+        for t in range(1, 100 - 40 + 1):
+            px = [la.sf.npx(40, s) if 40 + s <= 100 else 0.0 for s in (t - 1, t)]
+            py = [la.sf.npx(45, s) if 45 + s <= 100 else 0.0 for s in (t - 1, t)]
+            expected += la.v ** t * ((1 - px[1]) * (1 - py[1]) - (1 - px[0]) * (1 - py[0]))
+        assert abs(la.joint_life_assurance(40, 45) - expected) < 1e-12
+        assert la.joint_life_assurance(40, 45) < la.term_assurance(45, 55)
+
     def test_gross_premium(self, life_assurance):
         """Test gross premium calculations."""
         net_premium = 100
@@ -80,6 +161,46 @@ class TestLifeAssurance:
         reserve_endowment = life_assurance.reserve_endowment(30, 20, 5)
         assert reserve_endowment >= 0
 
+    def test_vectorized_reserves(self, life_assurance):
+        """Test vectorized reserves against the scalar methods."""
+        la = life_assurance
+        x = np.array([30, 30, 45, 60, 30])
+        n = np.array([20, 20, 25, 10, 5])
+        duration = np.array([5, 5, 0, 3, 5])
+
+        np.testing.assert_allclose(la.reserve_whole_life_vec(x, duration),
+                                   [la.reserve_whole_life(a, d) for a, d in zip(x, duration)])
+        np.testing.assert_allclose(la.reserve_term_vec(x, n, duration),
+                                   [la.reserve_term(a, m, d) for a, m, d in zip(x, n, duration)])
+        np.testing.assert_allclose(la.reserve_endowment_vec(x, n, duration),
+                                   [la.reserve_endowment(a, m, d) for a, m, d in zip(x, n, duration)])
+
+        with pytest.raises(ValueError):
+            la.reserve_whole_life_vec([95], [10])
+
+    def test_batch_premiums_and_portfolio(self, life_assurance):
+        """Test batched premiums and portfolio valuation against scalar methods."""
+        import pandas as pd
+
+        la = life_assurance
+        x = np.array([30, 45, 30])
+        n = np.array([20, 10, 20])
+
+        expected = [la.annual_premium(la.endowment_assurance(a, m), la.temporary_life_annuity(a, m))
+                    for a, m in zip(x, n)]
+        np.testing.assert_allclose(la.annual_premium_vec(x, n, product='endowment'), expected)
+        np.testing.assert_allclose(la.gross_premium_batch(x, n, initial_expenses=5.0),
+                                   la.annual_premium_vec(x, n) + 5.0)
+
+        policies = pd.DataFrame({'age': x, 'term': n, 'duration': [5, 0, 12]})
+        valued = la.valuate_portfolio(policies)
+        np.testing.assert_allclose(valued['reserve'],
+                                   [la.reserve_term(a, m, d) for a, m, d in zip(x, n, [5, 0, 12])])
+        assert list(policies.columns) == ['age', 'term', 'duration']
+
+        with pytest.raises(ValueError):
+            la.annual_premium_vec(x, n, product='unknown')
+
 
 class TestAnnuities:
     """Test cases for Annuities class."""
@@ -108,6 +229,13 @@ class TestAnnuities:
         expected_due = 100 * ((1 - (1.05) ** (-10)) / 0.05) * 1.05
         assert abs(due - expected_due) < 1e-10
 
+        # Per-instance specialisations agree with the reference methods
+        assert abs(imm - Annuities.immediate_annuity(ann, 10, 100)) < 1e-10
+        assert abs(due - Annuities.annuity_due(ann, 10, 100)) < 1e-10
+        zero_rate = Annuities(interest_rate=0.0)
+        assert zero_rate.immediate_annuity(10, payment=100) == 1000
+        assert zero_rate.annuity_due(10, payment=100) == 1000
+
     def test_life_annuities(self, annuities):
         """Test life annuity calculations."""
         ann = annuities
@@ -125,6 +253,44 @@ class TestAnnuities:
         whole = ann.life_annuity_immediate(30)
         assert temp < whole
 
+        # Commutation values agree with the survival function sums
+        assert abs(life_due - ann.sf.annuity_due(30)) < 1e-12
+        assert abs(temp - ann.sf.annuity_immediate(30, 20)) < 1e-12
+        assert abs(ann.temporary_life_annuity_due(90, 20) - ann.sf.annuity_due(90, 20)) < 1e-12
+
+        ann.i = 0.03
+        assert ann.life_annuity_due(30) > life_due
+        assert abs(ann.life_annuity_due(30) - ann.sf.annuity_due(30)) < 1e-12
+
+    def test_joint_life_annuity(self, annuities):
+        """Test the last survivor annuity under independent lives."""
+        ann = annuities
+        joint = ann.joint_life_annuity(40, 45)
+
+        assert joint > max(ann.life_annuity_immediate(40), ann.life_annuity_immediate(45))
+        assert joint < ann.life_annuity_immediate(40) + ann.life_annuity_immediate(45)
+
+        # A partner at the table's last age adds nothing to a single life annuity
+        assert abs(ann.joint_life_annuity(40, 100) - ann.life_annuity_immediate(40)) < 1e-10
+
+    def test_contingent_annuity(self, annuities):
+        """Test contingent annuity against the year-by-year sum."""
+        ann = annuities
+        expected = sum(ann.v ** (t - 1) * ann.sf.npx(40, t) * (1 - ann.sf.npx(45, t - 1)) * 100
+                       for t in range(1, 81))
+        assert abs(ann.contingent_annuity(40, 45, payment=100) - expected) < 1e-10
+
+    def test_contingent_annuity_numpy_path(self, annuities, monkeypatch):
+        """Test the NumPy contingent annuity used without Numba against the kernel."""
+        import actuneo.life.annuities as ann_module
+
+        ann = annuities
+        cases = [(40, 45), (30, 70), (90, 60)]
+        expected = [ann.contingent_annuity(x, y, payment=100) for x, y in cases]
+        monkeypatch.setattr(ann_module, 'NUMBA_AVAILABLE', False)
+        for value, (x, y) in zip(expected, cases):
+            assert abs(ann.contingent_annuity(x, y, payment=100) - value) < 1e-10
+
     def test_increasing_annuities(self, annuities_det):
         """Test increasing annuity calculations."""
         ann = annuities_det
@@ -137,7 +303,42 @@ class TestAnnuities:
         level_ann = ann.immediate_annuity(5, payment=100)
         assert inc_ann > level_ann
 
-    # Removed test for annuity_withdrawal as method doesn't exist
+        # Closed forms agree with the payment-by-payment sums
+        expected_inc = sum(100 * 1.08 ** (t - 1) * ann.v ** t for t in range(1, 6))
+        assert abs(inc_ann - expected_inc) < 1e-10
+        dec_ann = ann.decreasing_annuity(5, payment=100, decrease_rate=0.9)
+        expected_dec = sum(100 * 0.9 ** (t - 1) * ann.v ** t for t in range(1, 6))
+        assert abs(dec_ann - expected_dec) < 1e-10
+        assert abs(ann.decreasing_annuity(5, payment=100) - level_ann) < 1e-10
+        assert abs(ann.increasing_annuity(5, payment=100, increase_rate=0.05) - 500 * ann.v) < 1e-10
+        near = ann.increasing_annuity(5, payment=100, increase_rate=0.05 + 1e-9)
+        expected_near = sum(100 * (1.05 + 1e-9) ** (t - 1) * ann.v ** t for t in range(1, 6))
+        assert abs(near - expected_near) < 1e-10
+
+    def test_annuity_with_withdrawal(self, annuities_det):
+        """Test the closed-form withdrawal schedule against the balance recurrence."""
+        ann = annuities_det
+        result = ann.annuity_with_withdrawal(10000, 0.06, periods=10)
+        schedule = result['schedule']
+        payment = result['annual_payment']
+
+        assert len(schedule) == 10
+        assert schedule[0]['period'] == 1 and schedule[0]['starting_balance'] == 10000
+
+        remaining = 10000.0
+        for row in schedule:
+            assert abs(row['starting_balance'] - remaining) < 1e-8
+            assert abs(row['interest'] - remaining * ann.i) < 1e-8
+            remaining = remaining * (1 + ann.i) - payment
+            assert abs(row['ending_balance'] - remaining) < 1e-8
+        assert abs(result['remaining_principal'] - remaining) < 1e-8
+        np.testing.assert_array_equal(schedule.interest, schedule['interest'])
+
+        # Dictionaries are only built on request
+        rows = ann.annuity_with_withdrawal(10000, 0.06, periods=10, as_dicts=True)['schedule']
+        assert rows[0] == {'period': 1, 'starting_balance': 10000.0,
+                           'interest': schedule[0]['interest'], 'withdrawal': payment,
+                           'ending_balance': schedule[0]['ending_balance']}
 
 
 class TestReserves:
@@ -169,6 +370,39 @@ class TestReserves:
         endowment_reserve = reserves.prospective_reserve_endowment(30, 25, 10, annual_premium)
         assert endowment_reserve >= 0
 
+    def test_prospective_reserve_batch(self, reserves):
+        """Test batched whole life reserves against the scalar method."""
+        x = np.array([20, 30, 45, 60, 95])
+        duration = np.array([0, 5, 10, 20, 5])
+        premium = np.array([1.0, 1.5, 2.0, 3.0, 100.0])
+
+        batch = reserves.prospective_reserve_whole_life_batch(x, duration, premium, 1000.0)
+        expected = [reserves.prospective_reserve_whole_life(int(a), int(d), p)
+                    for a, d, p in zip(x, duration, premium)]
+        np.testing.assert_allclose(batch, expected, rtol=1e-12, atol=1e-10)
+
+        # Inputs broadcast; out-of-table attained ages are rejected
+        grid = reserves.prospective_reserve_whole_life_batch(x[:, None], [0, 5], 1.0)
+        assert grid.shape == (5, 2)
+        assert abs(grid[1, 1] - reserves.prospective_reserve_whole_life(30, 5, 1.0)) < 1e-10
+        with pytest.raises(ValueError):
+            reserves.prospective_reserve_whole_life_batch([95], [10], 1.0)
+
+    def test_prospective_reserve_batch_numpy_path(self, reserves, monkeypatch):
+        """Test the NumPy batch reserve used without Numba against the parallel kernel."""
+        import actuneo.life.reserves as reserves_module
+
+        x = np.array([20, 30, 45, 60, 95, 99])
+        duration = np.array([0, 5, 10, 20, 5, 1])
+        premium = np.array([1.0, 1.5, 2.0, 3.0, 100.0, 0.5])
+        compiled = reserves.prospective_reserve_whole_life_batch(x, duration, premium, 1000.0)
+
+        monkeypatch.setattr(reserves_module, 'NUMBA_AVAILABLE', False)
+        fallback = reserves.prospective_reserve_whole_life_batch(x, duration, premium, 1000.0)
+        np.testing.assert_allclose(fallback, compiled, rtol=1e-12, atol=1e-10)
+        with pytest.raises(ValueError):
+            reserves.prospective_reserve_whole_life_batch([95], [10], 1.0)
+
     def test_retrospective_reserve(self, reserves):
         """Test retrospective reserve calculations."""
         annual_premium = 1500
@@ -176,6 +410,24 @@ class TestReserves:
         retro_reserve = reserves.retrospective_reserve_whole_life(30, 8, annual_premium)
         assert retro_reserve >= 0
 
+        # Claims use the probability of dying in each year, (t-1)p_x - tp_x
+        sf = reserves.sf
+        expected = sum((annual_premium * sf.npx(30, t)
+                        - 1000.0 * (sf.npx(30, t) - sf.npx(30, t + 1))) * 1.05 ** t
+                       for t in range(8))
+        assert abs(retro_reserve - expected) < 1e-8
+        assert reserves.retrospective_reserve_whole_life(30, 0, annual_premium) == 0.0
+
+    def test_retrospective_reserve_numpy_path(self, reserves, monkeypatch):
+        """Test the NumPy retrospective reserve used without Numba against the kernel."""
+        import actuneo.life.reserves as reserves_module
+
+        cases = [(30, 8, 1500.0), (60, 25, 40.0), (95, 10, 5.0)]
+        expected = [reserves.retrospective_reserve_whole_life(*case) for case in cases]
+        monkeypatch.setattr(reserves_module, 'NUMBA_AVAILABLE', False)
+        for value, case in zip(expected, cases):
+            assert abs(reserves.retrospective_reserve_whole_life(*case) - value) < 1e-8
+
     def test_net_level_premium_reserve(self, reserves):
         """Test net level premium reserve."""
         net_premium = 1200
@@ -183,6 +435,15 @@ class TestReserves:
         nlp_reserve = reserves.net_level_premium_reserve(30, 7, net_premium)
         assert nlp_reserve >= 0
 
+        # Whole life values come from per-age tables built on first use
+        A_table, a_table = reserves._whole_life_tables()
+        sf = reserves.sf
+        assert abs(A_table[17] - sf.assurance(37)) < 1e-15
+        assert abs(a_table[17] - sf.annuity_immediate(37)) < 1e-12
+        np.testing.assert_allclose(A_table, sf.assurance_batch(reserves.mt.ages), rtol=1e-12)
+        expected = max(0, sf.assurance(37) * 1000.0 - net_premium * sf.annuity_immediate(37))
+        assert abs(nlp_reserve - expected) < 1e-9
+
     def test_gross_reserve(self, reserves):
         """Test gross reserve calculations."""
         net_reserve = 50000
@@ -204,3 +465,17 @@ class TestReserves:
         # After amortization period, should equal net reserve (fully amortized)
         zillmer_full = reserves.zillmerized_reserve(net_reserve, initial_expenses, 15)
         assert zillmer_full == net_reserve
+
+    def test_reserve_distribution(self, reserves):
+        """Test reserve distribution statistics."""
+        values = [1200.0, 50.0, 800.0, 3100.0, 0.0, 450.0, 975.0]
+
+        stats = reserves.reserve_distribution(values, total_portfolio_value=100000.0)
+        assert abs(stats['mean_reserve'] - np.mean(values)) < 1e-12
+        assert stats['median_reserve'] == np.median(values)
+        assert stats['min_reserve'] == 0.0 and stats['max_reserve'] == 3100.0
+        assert abs(stats['reserve_to_portfolio_ratio'] - sum(values) / 100000.0) < 1e-15
+        for label, q in [('25th', 25), ('75th', 75), ('90th', 90), ('95th', 95)]:
+            assert abs(stats['percentiles'][label] - np.percentile(values, q)) < 1e-12
+
+        assert reserves.reserve_distribution(values, 0.0)['reserve_to_portfolio_ratio'] == 0
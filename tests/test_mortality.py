@@ -2,6 +2,9 @@
 Tests for the mortality module.
 """
 
+import subprocess
+import sys
+
 import numpy as np
 import pytest
 from actuneo.mortality import MortalityTable, SurvivalFunctions
@@ -17,6 +20,29 @@ class TestMortalityTable:
         assert len(mt.ages) == len(mt.qx_values)
         assert np.all(mt.qx_values >= 0) and np.all(mt.qx_values <= 1)
 
+        # lx compounds px over gaps between ages and stays at zero after qx == 1
+        gapped = MortalityTable([20, 22, 25, 26], [0.1, 0.2, 1.0, 0.5], metadata={"radix": 1000})
+        np.testing.assert_allclose(gapped.lx_values, [1000, 810, 414.72, 0], rtol=1e-13)
+        assert gapped.ex(26) == 0.0
+
+    def test_float32_storage(self, sample_mortality_table):
+        """Test single-precision tables against the default float64 storage."""
+        mt = sample_mortality_table
+        mt32 = MortalityTable(mt.ages, mt.qx_values, dtype=np.float32)
+        assert mt32.qx_values.dtype == mt32.lx_values.dtype == np.float32
+
+        sf, sf32 = SurvivalFunctions(mt, 0.05), SurvivalFunctions(mt32, 0.05)
+        assert sf32.cum_log_px.dtype == np.float32
+        assert abs(sf32.assurance(40) - sf.assurance(40)) < 1e-6
+        assert abs(sf32.annuity_due(40) - sf.annuity_due(40)) < 1e-5
+
+        # lx below the float32 range keeps the table in float64
+        deep = MortalityTable(np.arange(0, 200), np.full(200, 0.5), dtype=np.float32)
+        assert deep.dtype == np.float64 and deep.lx_values.dtype == np.float64
+
+        with pytest.raises(ValueError):
+            MortalityTable(mt.ages, mt.qx_values, dtype=np.int32)
+
     def test_invalid_inputs(self):
         """Test error handling for invalid inputs."""
         ages = [20, 30, 40]
@@ -29,6 +55,19 @@ class TestMortalityTable:
         qx_invalid = [0.1, 1.5, 0.2]  # Value > 1
         with pytest.raises(ValueError):
             MortalityTable(ages, qx_invalid)
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            MortalityTable(ages, [0.1, np.nan, 0.2])
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            MortalityTable(ages, [0.1, -0.01, 0.2])
+
+        with pytest.raises(ValueError, match=r"Duplicate ages found: \[30\]"):
+            MortalityTable([40, 30, 20, 30], [0.1, 0.2, 0.3, 0.2])
+
+        # Unsorted input is reordered together with its extra columns
+        unsorted = MortalityTable([22, 20, 21], [0.3, 0.1, 0.2], table_columns={'mx': [3, 1, 2]})
+        assert unsorted.ages.tolist() == [20, 21, 22]
+        assert unsorted.qx_values.tolist() == [0.1, 0.2, 0.3]
+        assert unsorted.mx_values.tolist() == [1, 2, 3]
 
     def test_get_qx(self, sample_mortality_table):
         """Test qx retrieval."""
@@ -47,6 +86,13 @@ class TestMortalityTable:
         # Test age not in table
         qx_missing = mt.get_qx(15)  # Age below range
         assert np.isnan(qx_missing)
+        assert mt.get_qx(np.int64(30)) == qx_val == mt.get_qx([30])
+        assert isinstance(mt.get_qx(np.int64(30)), float)
+
+        # Mixed lookups, including ages above the range and inside a gap
+        gapped = MortalityTable([20, 22, 25], [0.01, 0.02, 0.03])
+        np.testing.assert_array_equal(gapped.get_qx([25, 21, 20, 30, 22]),
+                                      [0.03, np.nan, 0.01, np.nan, 0.02])
 
     def test_get_px(self, sample_mortality_table):
         """Test px retrieval."""
@@ -56,6 +102,10 @@ class TestMortalityTable:
         assert 0 <= px_val <= 1
         assert abs(px_val + mt.get_qx(30) - 1) < 1e-10  # px + qx = 1
 
+        px_vals = mt.get_px([30, 15, 50])
+        assert np.isnan(px_vals[1]) and np.isnan(mt.get_px(150))
+        np.testing.assert_allclose(px_vals[[0, 2]], mt.px_values[[10, 30]], rtol=0, atol=0)
+
     def test_life_expectancy(self, sample_mortality_table):
         """Test life expectancy calculations."""
         mt = sample_mortality_table
@@ -66,6 +116,26 @@ class TestMortalityTable:
         assert le_30 > le_50  # Life expectancy should decrease with age
         assert le_30 > 0 and le_50 > 0
 
+        # Life expectancy is Tx / lx at the same age
+        assert abs(le_30 - mt.Tx_values[10] / mt.lx_values[10]) < 1e-12
+        with pytest.raises(ValueError):
+            mt.life_expectancy(15)
+
+        ex_all = mt.life_expectancy_all()
+        assert ex_all.shape == mt.ages.shape and ex_all[10] == le_30
+        assert np.all(np.diff(ex_all) < 0)  # Shorter remaining lifetime with age
+
+        # Table-level npx looks ages up directly
+        assert abs(mt.npx(30, 5) - np.prod(mt.px_values[10:15])) < 1e-15
+        assert mt.npx(15, 5) == 0.0
+        assert abs(mt.npx(20, 80) - np.prod(mt.px_values[:80])) < 1e-14
+
+        # A certain death zeroes survival across it without disturbing earlier spans
+        dead = MortalityTable(ages=[20, 21, 22], qx=[0.1, 1.0, 0.2])
+        assert dead.npx(20, 2) == 0.0 and dead.npx(20, 5) == 0.0
+        assert abs(dead.npx(20, 1) - 0.9) < 1e-15
+        assert dead.lx_values[2] == 0.0
+
     def test_from_dataframe(self, sample_mortality_table):
         """Test creation from DataFrame."""
         import pandas as pd
@@ -80,6 +150,41 @@ class TestMortalityTable:
         assert len(mt_from_df.ages) == 10
         assert mt_from_df.name == "DataFrame Table"
 
+        # Nullable extension dtypes, with a missing ex value filled from Tx / lx
+        df_nullable = pd.DataFrame({
+            'age': pd.array([20, 21, 22], dtype="Int64"),
+            'qx': pd.array([0.01, 0.02, 0.03], dtype="Float64"),
+            'ex': pd.array([50.0, None, 48.0], dtype="Float64"),
+        })
+        mt_nullable = MortalityTable.from_dataframe(df_nullable)
+        assert mt_nullable.qx_values.dtype == np.float64
+        assert mt_nullable.ex(20) == 50.0 and not np.isnan(mt_nullable.ex(21))
+
+    def test_from_csv(self, tmp_path):
+        """Test loading a table and its extra columns from CSV."""
+        path = tmp_path / "small_table.csv"
+        path.write_text("age,qx,ex\n20,0.01,50.5\n21,0.02,\n22,0.03,48.7\n")
+
+        mt = MortalityTable.from_csv(str(path))
+        assert mt.name == "small_table"
+        np.testing.assert_array_equal(mt.ages, [20, 21, 22])
+        np.testing.assert_allclose(mt.qx_values, [0.01, 0.02, 0.03])
+        assert mt.ex(20) == 50.5
+        assert not np.isnan(mt.ex(21))  # Missing ex filled from Tx / lx
+
+        with pytest.raises(ValueError):
+            MortalityTable.from_csv(str(path), qx_col="q")
+
+        zw = MortalityTable.from_zimbabwe_2023("male_assured_lives")
+        assert zw.ages[0] == 20 and len(zw.ages) == 81
+
+    def test_import_does_not_load_pandas(self):
+        """Test that importing the package leaves pandas unloaded."""
+        code = "import sys, actuneo; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
+
 
 class TestSurvivalFunctions:
     """Test cases for SurvivalFunctions class."""
@@ -117,6 +222,57 @@ class TestSurvivalFunctions:
         assert sf.npx(30, 0) == 1.0  # Survive 0 years
         assert sf.npx(30, -1) == 0.0  # Invalid negative period
 
+        # Matches the direct product of px over the period
+        px = sample_mortality_table.px_values
+        assert abs(sf.npx(30, 25) - np.prod(px[10:35])) < 1e-14
+        assert len(sf.v_pow) == len(sample_mortality_table.ages) + 2
+
+        # Past the last age (100) survival continues at the last px, as in the table's npx
+        px_last = sample_mortality_table.px_values[-1]
+        assert abs(sf.npx(95, 10) - sf.npx(95, 6) * px_last ** 4) < 1e-15
+        assert abs(sf.npx(95, 10) - sample_mortality_table.npx(95, 10)) < 1e-15
+        assert abs(sf.npx(90, 60) - sf.npx(90, 40) * px_last ** 20) < 1e-15  # Beyond age 130
+        assert abs(sf.tpx(95, 10) - sf.npx(95, 10)) < 1e-15
+
+        # Ages outside or missing from a gapped table
+        gapped = SurvivalFunctions(MortalityTable([20, 22, 25], [0.01, 0.02, 0.03]), 0.05)
+        assert gapped.npx(21, 1) == 0.0
+        assert gapped.npx(10, 30) == 0.0
+        with pytest.raises(ValueError):
+            gapped.npx(21, 10)
+
+    def test_npx_array(self, sample_mortality_table):
+        """Test vectorized survival probabilities against scalar npx."""
+        sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
+
+        durations = np.arange(-1, 90)
+        for x in [20, 45, 100]:
+            expected = [sf.npx(x, int(n)) for n in durations]
+            np.testing.assert_allclose(sf.npx_array(x, durations), expected, rtol=1e-12, atol=0)
+
+    def test_npx_batch(self, sample_mortality_table):
+        """Test batched survival probabilities against scalar npx."""
+        sf = SurvivalFunctions(sample_mortality_table, 0.05)
+        x = np.array([20, 30, 55, 95, 100])
+        n = np.array([0, 10, -1, 20, 40])
+        expected = [sf.npx(int(a), int(k)) for a, k in zip(x, n)]
+        np.testing.assert_allclose(sf.npx_batch(x, n), expected, rtol=1e-12, atol=0)
+
+        # Broadcasting, and ages outside the table fall back to scalar npx
+        assert sf.npx_batch([[30], [40]], [1, 2, 3]).shape == (2, 3)
+        assert sf.npx_batch([15, 30], 5)[0] == 0.0
+
+    def test_npx_batch_numpy_path(self, sample_mortality_table, monkeypatch):
+        """Test the NumPy npx_batch used without Numba against the parallel kernel."""
+        import actuneo.mortality.survival_functions as sf_module
+
+        sf = SurvivalFunctions(sample_mortality_table, 0.05)
+        x = np.array([20, 30, 55, 95, 100, 90])
+        n = np.array([0, 10, -1, 20, 40, 60])
+        compiled = sf.npx_batch(x, n)
+        monkeypatch.setattr(sf_module, 'NUMBA_AVAILABLE', False)
+        np.testing.assert_allclose(sf.npx_batch(x, n), compiled, rtol=1e-12, atol=0)
+
     def test_nqx(self, sample_mortality_table):
         """Test n-year mortality probability."""
         sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
@@ -137,6 +293,11 @@ class TestSurvivalFunctions:
         assert 0 < p_half < 1
         assert p_half > p1  # Half year should have higher survival than full year
 
+        # Uniform distribution of deaths within the year
+        qx_40 = sample_mortality_table.get_qx(40)
+        assert abs(sf.tpx(30, 10.25) - sf.npx(30, 10) * (1 - 0.25 * qx_40)) < 1e-15
+        assert sf.tpx(30, 10.0) == sf.npx(30, 10)
+
     def test_annuity_calculations(self, sample_mortality_table):
         """Test annuity calculations."""
         sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
@@ -153,6 +314,16 @@ class TestSurvivalFunctions:
         whole_ann = sf.annuity_immediate(30)
         assert whole_ann > imm_ann  # Whole life should be larger than term
 
+        # Immediate annuity pays at the end of years 1..n
+        expected = sum(sf.v ** t * sf.npx(30, t) for t in range(1, 11))
+        assert abs(imm_ann - expected) < 1e-12
+        assert abs(imm_ann - (due_ann - 1 + sf.v ** 10 * sf.npx(30, 10))) < 1e-12
+
+        # Term annuities run past the end of the table via tpx
+        for n in [10, 75]:
+            expected = sum(sf.v ** t * sf.tpx(30, t) for t in range(n))
+            assert abs(sf.annuity_due(30, n) - expected) < 1e-12
+
     def test_assurance_calculations(self, sample_mortality_table):
         """Test assurance calculations."""
         sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
@@ -165,3 +336,67 @@ class TestSurvivalFunctions:
         term_ass = sf.assurance(30, n=20)
         assert term_ass < whole_ass  # Term should be less than whole life
         assert term_ass > 0
+
+        # Each year is weighted by the probability of dying in that year
+        expected = sum(sf.v ** t * (sf.npx(30, t - 1) - sf.npx(30, t)) for t in range(1, 21))
+        assert abs(term_ass - expected) < 1e-12
+
+        # Certain death at 22: survival past it is exactly zero, not the log-space floor
+        mt = MortalityTable(np.arange(20, 26), [0.1, 0.1, 1.0, 0.2, 0.3, 0.4])
+        sf_dead = SurvivalFunctions(mt, interest_rate=0.05)
+        assert sf_dead.npx(20, 3) == 0.0
+        assert np.all(sf_dead.npx_array(20, np.arange(3, 6)) == 0.0)
+        assert abs(sf_dead.npx(23, 2) - 0.56) < 1e-15
+        v = sf_dead.v
+        assert abs(sf_dead.assurance(20) - (0.1 * v + 0.09 * v ** 2 + 0.81 * v ** 3)) < 1e-15
+
+    def test_memoized_values(self, sample_mortality_table):
+        """Test that repeated queries are served from the instance cache."""
+        sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
+
+        first = sf.assurance(40, 20)
+        assert ('A', 40, 20) in sf._cache
+        assert sf.assurance(40, 20) == first
+        sf.annuity_due(40)
+        sf.npx(40, 5)
+        assert ('a_due', 40, None) in sf._cache and ('npx', 40, 5) in sf._cache
+
+    def test_batch_values(self, sample_mortality_table):
+        """Test batched assurance and annuity values against the scalar methods."""
+        sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
+
+        x = np.array([20, 30, 55, 90, 100])
+        n = np.array([0, 10, 40, 20, 3])
+        np.testing.assert_allclose(sf.assurance_batch(x, n),
+                                   [sf.assurance(a, k) for a, k in zip(x, n)], atol=1e-13)
+        np.testing.assert_allclose(sf.annuity_due_batch(x, n),
+                                   [sf.annuity_due(a, k) for a, k in zip(x, n)], atol=1e-13)
+        np.testing.assert_allclose(sf.assurance_batch(x), [sf.assurance(a) for a in x], atol=1e-13)
+        np.testing.assert_allclose(sf.annuity_due_batch(x), [sf.annuity_due(a) for a in x],
+                                   atol=1e-13)
+
+        with pytest.raises(ValueError):
+            sf.assurance_batch([19, 30])
+
+        # Deferred death probabilities are never negative, even across the table end
+        assert np.all(sf.assurance_batch(np.arange(60, 101), 40) >= 0)
+        assert sf.assurance(99, 5) >= sf.assurance(99, 1)
+
+    def test_endowment_components(self, sample_mortality_table):
+        """Test the fused endowment pieces against the separate methods."""
+        sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
+
+        for x, n in [(30, 20), (60, 40), (100, 1)]:
+            expected = (sf.assurance(x, n), sf.npx(x, n) * sf.v ** n, sf.annuity_due(x, n))
+            np.testing.assert_allclose(sf.endowment_components(x, n), expected, rtol=1e-12)
+
+    def test_commutation_columns(self, sample_mortality_table):
+        """Test commutation columns reproduce survival probabilities and annuities."""
+        sf = SurvivalFunctions(sample_mortality_table, interest_rate=0.05)
+        columns = sf.commutation_columns()
+        D, N = columns['D'], columns['N']
+
+        idx = 30 - 20
+        assert abs(D[idx + 10] / D[idx] - sf.npx(30, 10) * sf.v ** 10) < 1e-14
+        assert abs((N[idx] - N[idx + 10]) / D[idx] - sf.annuity_due(30, 10)) < 1e-12
+        assert sf.commutation_columns() is columns